@@ -4,6 +4,8 @@ Example usage of MiiBrowser CSS Parser
 This script demonstrates the various capabilities of the CSS parser module.
 """
 
+from pathlib import Path
+
 from miibrowser.css_parser import (
     CSSParser, 
     parse_inline_style, 
@@ -12,99 +14,59 @@ from miibrowser.css_parser import (
 )
 
 
+# Example CSS, read once from the fixture next to this script
+EXAMPLE_CSS = (Path(__file__).parent / "demo.css").read_text(encoding="utf-8")
+
+# Stylesheet covering the different color notations
+COLOR_CSS = """
+.red { color: #ff0000; background: red; }
+.blue { color: rgb(0, 0, 255); }
+.green { color: rgba(0, 255, 0, 0.5); }
+.yellow { background: hsl(60, 100%, 50%); }
+"""
+
+
 def main():
     print("=" * 70)
     print("MiiBrowser CSS Parser - Example Usage")
     print("=" * 70)
     print()
     
-    # Example CSS
-    example_css = """
-    /* Main styles */
-    body {
-        font-family: Arial, sans-serif;
-        background-color: #f0f0f0;
-        margin: 0;
-        padding: 20px;
-        line-height: 1.6;
-    }
-    
-    .header {
-        color: #333;
-        font-size: 24px;
-        font-weight: bold;
-        border-bottom: 2px solid #4285f4;
-    }
-    
-    #main-content {
-        background-color: white;
-        border: 1px solid #ddd;
-        padding: 15px;
-        border-radius: 5px;
-    }
-    
-    .button {
-        background-color: #4285f4;
-        color: white;
-        padding: 10px 20px;
-        border: none;
-        border-radius: 3px;
-    }
-    
-    .button:hover {
-        background-color: #357ae8;
-    }
-    
-    @media (max-width: 768px) {
-        body {
-            padding: 10px;
-        }
-        
-        .header {
-            font-size: 18px;
-        }
-    }
-    """
-    
     # Initialize parser
     parser = CSSParser()
     
     # Example 1: Parse and display stylesheet structure
     print("1. PARSING STYLESHEET")
     print("-" * 70)
-    rules = parser.parse_stylesheet(example_css)
+    rules = parser.parse_stylesheet(EXAMPLE_CSS)
     print(f"   Total rules found: {len(rules)}")
     print()
     
     # Example 2: Extract all selectors
     print("2. EXTRACTING SELECTORS")
     print("-" * 70)
-    selectors = parser.extract_selectors(example_css)
-    for i, selector in enumerate(selectors, 1):
-        print(f"   {i}. {selector}")
+    selectors = parser.extract_selectors(EXAMPLE_CSS)
+    print("\n".join(f"   {i}. {selector}" for i, selector in enumerate(selectors, 1)))
     print()
     
     # Example 3: Extract all colors
     print("3. EXTRACTING COLORS")
     print("-" * 70)
-    colors = parser.extract_colors(example_css)
-    unique_colors = list(set(colors))
-    for i, color in enumerate(unique_colors, 1):
-        print(f"   {i}. {color}")
+    unique_colors = parser.extract_colors(EXAMPLE_CSS, unique=True)
+    print("\n".join(f"   {i}. {color}" for i, color in enumerate(unique_colors, 1)))
     print()
     
     # Example 4: Extract specific property
     print("4. EXTRACTING FONT-SIZE PROPERTIES")
     print("-" * 70)
-    font_sizes = parser.extract_properties(example_css, "font-size")
-    for selector, value in font_sizes:
-        print(f"   {selector} -> {value}")
+    font_sizes = parser.extract_properties(EXAMPLE_CSS, "font-size")
+    print("\n".join(f"   {selector} -> {value}" for selector, value in font_sizes))
     print()
     
     # Example 5: Get all declarations organized by selector
     print("5. ALL DECLARATIONS BY SELECTOR")
     print("-" * 70)
-    all_decls = parser.get_all_declarations(example_css)
+    all_decls = parser.get_all_declarations(EXAMPLE_CSS)
     for selector, declarations in list(all_decls.items())[:3]:  # Show first 3
         print(f"   {selector}:")
         for decl in declarations[:5]:  # Show first 5 properties
@@ -119,14 +81,13 @@ def main():
     inline_parsed = parse_inline_style(inline_style)
     print(f"   Input: {inline_style}")
     print(f"   Parsed:")
-    for prop, value in inline_parsed.items():
-        print(f"      • {prop}: {value}")
+    print("\n".join(f"      • {prop}: {value}" for prop, value in inline_parsed.items()))
     print()
     
     # Example 7: Extract media queries
     print("7. EXTRACTING MEDIA QUERIES")
     print("-" * 70)
-    media_queries = parser.parse_media_queries(example_css)
+    media_queries = parser.parse_media_queries(EXAMPLE_CSS)
     for i, mq in enumerate(media_queries, 1):
         print(f"   Media Query {i}:")
         print(f"      Condition: {mq['condition']}")
@@ -136,10 +97,10 @@ def main():
     # Example 8: Minify CSS
     print("8. CSS MINIFICATION")
     print("-" * 70)
-    minified = parser.minify_css(example_css)
-    print(f"   Original size: {len(example_css)} characters")
+    minified = parser.minify_css(EXAMPLE_CSS)
+    print(f"   Original size: {len(EXAMPLE_CSS)} characters")
     print(f"   Minified size: {len(minified)} characters")
-    print(f"   Reduction: {((len(example_css) - len(minified)) / len(example_css) * 100):.1f}%")
+    print(f"   Reduction: {((len(EXAMPLE_CSS) - len(minified)) / len(EXAMPLE_CSS) * 100):.1f}%")
     print(f"   Minified (first 100 chars): {minified[:100]}...")
     print()
     
@@ -183,16 +144,9 @@ def main():
     # Example 11: Advanced color extraction
     print("11. ADVANCED COLOR EXTRACTION")
     print("-" * 70)
-    color_css = """
-        .red { color: #ff0000; background: red; }
-        .blue { color: rgb(0, 0, 255); }
-        .green { color: rgba(0, 255, 0, 0.5); }
-        .yellow { background: hsl(60, 100%, 50%); }
-    """
-    colors = extract_css_colors(color_css)
+    colors = extract_css_colors(COLOR_CSS)
     print(f"   Found {len(colors)} color values:")
-    for i, color in enumerate(colors, 1):
-        print(f"      {i}. {color}")
+    print("\n".join(f"      {i}. {color}" for i, color in enumerate(colors, 1)))
     print()
     
     # Summary
@@ -5,30 +5,31 @@ This creates a local HTTP server with test pages that have relative links.
 """
 
 import http.server
-import socketserver
-import os
-from pathlib import Path
 
 PORT = 8000
 
-class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    """Custom handler that serves test pages"""
-    
-    def do_GET(self):
-        """Handle GET requests"""
-        
-        # Serve different pages based on path
-        if self.path == '/':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            html_content = """
+# Shared page template; every test page only differs in title and body
+_HEADER = b"""
 <!DOCTYPE html>
 <html>
 <head>
-    <title>Home - Relative Links Test</title>
+    <title>%s</title>
 </head>
 <body>
+"""
+_FOOTER = b"""</body>
+</html>
+"""
+
+
+def _page(title, body):
+    """Assemble a complete test page as bytes"""
+    return b"".join([_HEADER % title, body, _FOOTER])
+
+
+# Static test pages, encoded once at import time
+_RESPONSES = {
+    '/': _page(b"Home - Relative Links Test", b"""\
     <h1>Home Page</h1>
     <p>This is the home page.</p>
     <ul>
@@ -37,100 +38,63 @@ class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         <li><a href="subpage.html">Subpage (relative)</a></li>
         <li><a href="/docs/help">Help Docs</a></li>
     </ul>
-</body>
-</html>
-"""
-            self.wfile.write(html_content.encode())
-            
-        elif self.path == '/about':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            html_content = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>About - Relative Links Test</title>
-</head>
-<body>
+"""),
+    '/about': _page(b"About - Relative Links Test", b"""\
     <h1>About Page</h1>
     <p>You successfully navigated to /about using a relative link!</p>
     <ul>
         <li><a href="/">Back to Home</a></li>
         <li><a href="/contact">Contact</a></li>
     </ul>
-</body>
-</html>
-"""
-            self.wfile.write(html_content.encode())
-            
-        elif self.path == '/contact':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            html_content = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Contact - Relative Links Test</title>
-</head>
-<body>
+"""),
+    '/contact': _page(b"Contact - Relative Links Test", b"""\
     <h1>Contact Page</h1>
     <p>You successfully navigated to /contact using a relative link!</p>
     <ul>
         <li><a href="/">Back to Home</a></li>
         <li><a href="/about">About</a></li>
     </ul>
-</body>
-</html>
-"""
-            self.wfile.write(html_content.encode())
-            
-        elif self.path == '/docs/help':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            html_content = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Help - Relative Links Test</title>
-</head>
-<body>
+"""),
+    '/docs/help': _page(b"Help - Relative Links Test", b"""\
     <h1>Help Documentation</h1>
     <p>You successfully navigated to /docs/help!</p>
     <ul>
         <li><a href="/">Back to Home</a></li>
         <li><a href="../about">About (parent directory)</a></li>
     </ul>
-</body>
-</html>
-"""
-            self.wfile.write(html_content.encode())
-            
-        else:
-            # Default 404
-            self.send_response(404)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>404 Not Found</title>
-</head>
-<body>
+"""),
+}
+
+_NOT_FOUND = b"""\
     <h1>404 - Page Not Found</h1>
-    <p>The page <code>{self.path}</code> was not found.</p>
+    <p>The page <code>%s</code> was not found.</p>
     <p><a href="/">Go to Home</a></p>
-</body>
-</html>
 """
-            self.wfile.write(html_content.encode())
+
+
+class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Custom handler that serves test pages"""
+    
+    def do_GET(self):
+        """Handle GET requests"""
+        body = _RESPONSES.get(self.path)
+        if body is None:
+            # Default 404
+            self._send_html(404, _page(b"404 Not Found", _NOT_FOUND % self.path.encode()))
+        else:
+            self._send_html(200, body)
+    
+    def _send_html(self, status, body):
+        """Send an HTML response with an explicit Content-Length"""
+        self.send_response(status)
+        self.send_header('Content-type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
 def main():
     """Start the test server"""
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+    with http.server.ThreadingHTTPServer(("", PORT), MyHTTPRequestHandler) as httpd:
         print("=" * 60)
         print("MiiBrowser Relative Links Test Server")
         print("=" * 60)
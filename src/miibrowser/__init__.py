@@ -2,13 +2,21 @@
 MiiBrowser - A simple web browser with DuckDuckGo search
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "MiiBrowser Team"
 
-from miibrowser.browser import MiiBrowser
-from miibrowser.css_parser import CSSParser, parse_inline_style, extract_css_colors, validate_css
-from miibrowser.css_enhancer import get_enhanced_css
-from miibrowser import config
+# Public names and the submodules that provide them. They are imported on
+# first access so that e.g. `validate_css` does not pull in tkinter.
+_LAZY = {
+    'MiiBrowser': 'miibrowser.browser',
+    'CSSParser': 'miibrowser.css_parser',
+    'parse_inline_style': 'miibrowser.css_parser',
+    'extract_css_colors': 'miibrowser.css_parser',
+    'validate_css': 'miibrowser.css_parser',
+    'get_enhanced_css': 'miibrowser.css_enhancer',
+}
 
 __all__ = [
     'MiiBrowser',
@@ -16,3 +24,18 @@ __all__ = [
     'get_enhanced_css',
     'config',
 ]
+
+
+def __getattr__(name):
+    if name == 'config':
+        value = importlib.import_module('miibrowser.config')
+    elif name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,10 +2,19 @@
 MiiBrowser - Chrome-style browser with tabs and DuckDuckGo search
 """
 
+import atexit
+import logging
+import re
+import sys
 import tkinter as tk
 from tkinter import ttk
 import urllib.parse
-from typing import Optional, Dict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, List
+import requests
+from requests.adapters import HTTPAdapter
 from miibrowser.search import DuckDuckGoSearch
 from miibrowser.css_enhancer import get_enhanced_css
 from miibrowser import config
@@ -17,6 +26,185 @@ except ImportError:
     WEBVIEW_AVAILABLE = False
     print("Warning: tkinterweb not available. Links will open externally.")
 
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+# Page fetches for CSS enhancement run here so the Tk thread never blocks
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="miibrowser-fetch")
+# Shared by all tabs so repeat visits to a host reuse keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+_SESSION.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+_SESSION.headers['User-Agent'] = config.USER_AGENT
+
+# <style> block injected into every enhanced page; the CSS never changes
+_ENHANCED_STYLE_TAG = f"<style>{get_enhanced_css()}</style>"
+# Opening <head> / <html> tags, in any case and with or without attributes
+_HEAD_TAG_RE = re.compile(r'<head(?:\s[^>]*)?>', re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r'<html(?:\s[^>]*)?>', re.IGNORECASE)
+# Read size for streamed page downloads
+_FETCH_CHUNK_SIZE = 64 * 1024
+# How often (ms) the Tk thread checks whether a background fetch finished
+_FETCH_POLL_MS = 50
+# URL poll interval (ms) for webviews that do not report URL changes
+_URL_POLL_MS = 3000
+
+# Result links on DuckDuckGo point here with the real target in "uddg"
+_DDG_REDIRECT_MARKER = 'duckduckgo.com/l/?uddg='
+
+# Windows reports mouse wheel deltas in multiples of this
+_WHEEL_DIV = 120
+
+# Shared widget options for the toolbar and tab bar
+_ICON_BUTTON_STYLE = {
+    'bg': "#FFFFFF",
+    'fg': "#5F6368",
+    'relief': tk.FLAT,
+    'cursor': "hand2",
+    'borderwidth': 0,
+}
+# Back/forward/reload start disabled until a page is loaded
+_NAV_BUTTON_STYLE = dict(_ICON_BUTTON_STYLE, width=2, state=tk.DISABLED)
+# Tab title and close buttons, in their inactive colors
+_TAB_BUTTON_STYLE = {
+    'bg': "#E8EAED",
+    'fg': "#202124",
+    'font': ("Segoe UI", 10),
+    'relief': tk.FLAT,
+    'cursor': "hand2",
+    'width': 20,
+    'anchor': tk.W,
+    'borderwidth': 0,
+    'padx': 10,
+}
+_TAB_CLOSE_STYLE = dict(_ICON_BUTTON_STYLE, bg="#E8EAED", font=("Segoe UI", 12, "bold"), width=2)
+_ENTRY_STYLE = {
+    'font': ("Segoe UI", 12),
+    'bg': "#E8EAED",
+    'fg': "#202124",
+    'insertbackground': "#202124",
+    'relief': tk.FLAT,
+    'borderwidth': 0,
+}
+
+# Top-level domains that make a bare "name.tld" entry count as an address
+_COMMON_TLDS = frozenset({
+    'com', 'org', 'net', 'edu', 'gov', 'io', 'co', 'us', 'uk',
+    'de', 'fr', 'it', 'es', 'nl', 'ru', 'cn', 'jp', 'br', 'au',
+    'ca', 'in', 'eu', 'info', 'biz', 'cz', 'sk', 'pl', 'at',
+    'ch', 'me', 'tv', 'cc', 'dev', 'app', 'xyz',
+})
+
+
+@lru_cache(maxsize=256)
+def _duckduckgo_url(query: str) -> str:
+    """Build the DuckDuckGo search URL for a query"""
+    return f"https://duckduckgo.com/?q={urllib.parse.quote_plus(query)}"
+
+
+@lru_cache(maxsize=256)
+def _resolve_query(query: str) -> str:
+    """Turn address bar input into the URL to open"""
+    # Check if it's a URL
+    if query.startswith(('http://', 'https://')):
+        return query
+    if query.startswith('www.'):
+        return 'https://' + query
+    if '.' in query and ' ' not in query:
+        # Check if the part after the last dot looks like a valid TLD
+        tld = query.rsplit('.', 1)[-1].lower().split('/')[0]
+        if tld in _COMMON_TLDS:
+            return 'https://' + query
+    
+    # It's a search query - create DuckDuckGo URL
+    return _duckduckgo_url(query)
+
+
+@lru_cache(maxsize=1024)
+def _title_from_url(url: str) -> str:
+    """Derive a short tab title (the domain) from a URL"""
+    try:
+        domain = urllib.parse.urlsplit(url).netloc
+    except ValueError:
+        domain = ""
+    domain = domain or url[:30]
+    return domain[:25] + "..." if len(domain) > 25 else domain
+
+
+def _normalize_url(url: str) -> str:
+    """Unwrap a DuckDuckGo result redirect to the page it points at.
+    
+    Args:
+        url: URL reported by or passed to the webview
+        
+    Returns:
+        The target of the redirect, or the URL unchanged
+    """
+    if _DDG_REDIRECT_MARKER not in url:
+        return url
+    try:
+        params = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+    except ValueError as e:
+        log.debug("Error handling DuckDuckGo redirect: %s", e)
+        return url
+    if 'uddg' in params:
+        return urllib.parse.unquote(params['uddg'][0])
+    return url
+
+
+def _fetch_enhanced_html(url: str) -> Optional[str]:
+    """Download a page and inject the enhanced CSS and a <base> tag.
+    
+    Runs on a worker thread, so it must not touch any Tk widgets.
+    
+    Args:
+        url: Address of the page to fetch
+        
+    Returns:
+        The rewritten HTML, or None if the server did not answer with 200
+    """
+    with _SESSION.get(url, timeout=config.REQUEST_TIMEOUT, stream=True) as response:
+        if response.status_code != 200:
+            return None
+        
+        # Read at most MAX_PAGE_BYTES so a huge page cannot exhaust memory
+        body = bytearray()
+        for chunk in response.iter_content(_FETCH_CHUNK_SIZE):
+            body += chunk
+            if len(body) >= config.MAX_PAGE_BYTES:
+                del body[config.MAX_PAGE_BYTES:]
+                break
+        
+        html_content = body.decode(response.encoding or 'utf-8', errors='replace')
+        
+        # Get the base URL for relative links (handle redirects)
+        base_url = response.url if response.url else url
+    
+    # Inject enhanced CSS and base tag into the HTML
+    enhanced_head = f'<base href="{base_url}">{_ENHANCED_STYLE_TAG}'
+    
+    # Try to inject CSS and base tag after <head> tag or at the beginning
+    match = _HEAD_TAG_RE.search(html_content)
+    if not match:
+        match = _HTML_TAG_RE.search(html_content)
+        if not match:
+            return f'<html><head>{enhanced_head}</head><body>{html_content}</body></html>'
+        enhanced_head = f'<head>{enhanced_head}</head>'
+    end = match.end()
+    return f'{html_content[:end]}{enhanced_head}{html_content[end:]}'
+
+
+def _release_shared_resources():
+    """Stop the fetch pool and close pooled connections at interpreter exit"""
+    _EXECUTOR.shutdown(wait=False)
+    _SESSION.close()
+
+
+# The pool and session outlive any one window, so a later MiiBrowser in the
+# same process can still fetch; they are released only when Python exits
+atexit.register(_release_shared_resources)
+
 
 class BrowserTab:
     """Represents a single browser tab"""
@@ -29,21 +217,30 @@ class BrowserTab:
         self.current_url = ""
         self.is_showing_web = False
         self.on_navigation_callback = None
-        self.history = []
+        # Oldest entries fall off once MAX_HISTORY is reached
+        self.history = deque(maxlen=config.MAX_HISTORY)
         self.history_index = -1
+        # Bumped on every navigation so stale background fetches are dropped
+        self._nav_token = 0
+        self._use_polling = False
+        self._poll_after_id = None
         
         # Create tab content frame
         self.content_frame = tk.Frame(parent_frame, bg="#FFFFFF")
         
-        # Create search results area
-        self._create_search_area()
-        
-        # Create web viewer area
-        if WEBVIEW_AVAILABLE:
+        # The search area is built on first show() and the web viewer on
+        # first load_url(), so tabs that are never visited stay cheap
+    
+    def _ensure_search_area(self):
+        """Create and show the search area if it does not exist yet"""
+        if not hasattr(self, 'search_frame'):
+            self._create_search_area()
+            self.search_frame.pack(fill=tk.BOTH, expand=True)
+    
+    def _ensure_webview_area(self):
+        """Create the web viewer area if it does not exist yet"""
+        if not hasattr(self, 'webview_frame'):
             self._create_webview_area()
-        
-        # Show search area by default
-        self.search_frame.pack(fill=tk.BOTH, expand=True)
     
     def _create_search_area(self):
         """Create search results display area"""
@@ -54,23 +251,32 @@ class BrowserTab:
         scrollbar = ttk.Scrollbar(self.search_frame, orient="vertical", command=self.canvas.yview)
         
         self.scrollable_frame = tk.Frame(self.canvas, bg="#FFFFFF")
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
+        self._scrollregion_after = None
+        self._scrollregion = None
+        self._frame_size = (0, 0)
+        self.scrollable_frame.bind("<Configure>", self._schedule_scrollregion_update)
         
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=scrollbar.set)
         
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Mouse wheel scrolling
-        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
     
-    def _on_mousewheel(self, event):
-        """Handle mouse wheel scrolling"""
-        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+    def _schedule_scrollregion_update(self, event):
+        """Coalesce <Configure> bursts into one scrollregion update"""
+        # The frame is the canvas's only item and sits at (0, 0), so its
+        # size is the scrollregion; no need to walk items with bbox("all")
+        self._frame_size = (event.width, event.height)
+        if self._scrollregion_after is None:
+            self._scrollregion_after = self.canvas.after_idle(self._update_scrollregion)
+    
+    def _update_scrollregion(self):
+        """Resize the canvas scrollregion to fit its contents"""
+        self._scrollregion_after = None
+        region = (0, 0) + self._frame_size
+        if region != self._scrollregion:
+            self._scrollregion = region
+            self.canvas.configure(scrollregion=region)
     
     def _create_webview_area(self):
         """Create web viewer area"""
@@ -82,194 +288,190 @@ class BrowserTab:
         )
         self.html_widget.pack(fill=tk.BOTH, expand=True)
         self._last_checked_url = None
-        self._check_pending = False
+        self._use_polling = not self._hook_url_events()
     
     def _on_url_changed(self, url):
         """Called when URL changes in webview"""
         try:
             if url and url != self.current_url and url != "about:blank":
                 # Handle DuckDuckGo redirect URLs
-                if 'duckduckgo.com/l/?uddg=' in url:
-                    try:
-                        parsed = urllib.parse.urlparse(url)
-                        params = urllib.parse.parse_qs(parsed.query)
-                        if 'uddg' in params:
-                            actual_url = urllib.parse.unquote(params['uddg'][0])
-                            self.html_widget.load_url(actual_url)
-                            return
-                    except Exception as e:
-                        print(f"Error handling DuckDuckGo redirect: {e}")
+                actual_url = _normalize_url(url)
+                if actual_url != url:
+                    self.html_widget.load_url(actual_url)
+                    return
                 
-                # Update history
-                if self.history_index == len(self.history) - 1:
-                    self.history.append(url)
-                    self.history_index = len(self.history) - 1
-                elif self.history_index < len(self.history) - 1:
-                    self.history = self.history[:self.history_index + 1]
-                    self.history.append(url)
-                    self.history_index = len(self.history) - 1
+                # Update history, dropping any forward entries first
+                while len(self.history) > self.history_index + 1:
+                    self.history.pop()
+                self.history.append(url)
+                self.history_index = len(self.history) - 1
                 
                 self.current_url = url
                 self._last_checked_url = url
-                # Extract domain for title
-                domain = url.split('//')[1].split('/')[0] if '//' in url else url[:30]
-                self.title = domain[:25] + "..." if len(domain) > 25 else domain
+                self._nav_token += 1
+                self.title = _title_from_url(url)
                 
                 # Trigger callback to update UI
                 if self.on_navigation_callback:
                     self.on_navigation_callback(url, self.title)
         except Exception as e:
-            print(f"Error in _on_url_changed: {e}")
+            log.warning("Error in _on_url_changed: %s", e)
+    
+    def _hook_url_events(self) -> bool:
+        """Subscribe to URL changes from the webview.
+        
+        Returns:
+            True if the webview reports URL changes itself, False if they
+            have to be polled for
+        """
+        on_url_change = getattr(self.html_widget, 'on_url_change', None)
+        if on_url_change is not None:
+            # tkinterweb 3.x callback API
+            on_url_change(self._on_url_changed)
+            return True
+        try:
+            from tkinterweb.utilities import URL_CHANGED_EVENT
+        except ImportError:
+            return False
+        # tkinterweb 4.x posts a virtual event and exposes the URL as a property
+        self.html_widget.bind(
+            URL_CHANGED_EVENT,
+            lambda e: self._on_url_changed(self.html_widget.current_url)
+        )
+        return True
     
-    def _start_url_polling(self):
-        """Start URL change detection"""
-        if hasattr(self, 'html_widget') and self.is_showing_web:
-            self._check_url_change_fallback()
+    def _schedule_url_poll(self):
+        """Queue the next fallback URL check, replacing any pending one"""
+        self._cancel_url_poll()
+        self._poll_after_id = self.parent_frame.after(_URL_POLL_MS, self._check_url_change_fallback)
+    
+    def _cancel_url_poll(self):
+        """Drop the pending fallback URL check, if any"""
+        if self._poll_after_id is not None:
+            self.parent_frame.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
     
     def _check_url_change_fallback(self):
         """Fallback URL check - only used if event system not available"""
+        self._poll_after_id = None
+        if not self.is_showing_web:
+            return
         try:
-            # Prevent multiple simultaneous checks
-            if self._check_pending:
-                return
+            try:
+                new_url = self.html_widget.get_url()
+            except Exception:
+                new_url = getattr(self.html_widget, 'current_url', None)
             
-            self._check_pending = True
+            # Only trigger if URL actually changed and is different from last check
+            if new_url and new_url != self._last_checked_url and new_url != "about:blank":
+                self._on_url_changed(new_url)
             
-            if hasattr(self, 'html_widget') and self.is_showing_web:
-                new_url = None
-                try:
-                    new_url = self.html_widget.get_url()
-                except:
-                    try:
-                        new_url = self.html_widget.current_url
-                    except:
-                        pass
-                
-                # Only trigger if URL actually changed and is different from last check
-                if new_url and new_url != self._last_checked_url and new_url != "about:blank":
-                    self._on_url_changed(new_url)
-                
-                # Check again after 1.5 seconds for responsive URL tracking
-                if self.is_showing_web and hasattr(self, 'parent_frame'):
-                    try:
-                        if self.parent_frame.winfo_exists():
-                            self.parent_frame.after(1500, self._delayed_check)
-                    except:
-                        pass
-            
-            self._check_pending = False
+            if self.html_widget.winfo_exists():
+                self._schedule_url_poll()
         except Exception as e:
-            print(f"Error in fallback URL check: {e}")
-            self._check_pending = False
-    
-    def _delayed_check(self):
-        """Delayed check to avoid interference with rendering"""
-        self._check_pending = False
-        if hasattr(self, 'is_showing_web') and self.is_showing_web:
-            self._check_url_change_fallback()
+            log.warning("Error in fallback URL check: %s", e)
     
     def show(self):
         """Show this tab's content"""
+        if not self.is_showing_web:
+            self._ensure_search_area()
         self.content_frame.pack(fill=tk.BOTH, expand=True)
+        if self.is_showing_web and self._use_polling:
+            self._schedule_url_poll()
     
     def hide(self):
         """Hide this tab's content"""
         self.content_frame.pack_forget()
+        if self._use_polling:
+            self._cancel_url_poll()
+    
+    def destroy(self):
+        """Cancel pending callbacks and destroy this tab's widgets"""
+        # Any fetch still in flight is dropped by _poll_fetch
+        self._nav_token += 1
+        self._cancel_url_poll()
+        if getattr(self, '_scrollregion_after', None) is not None:
+            self.canvas.after_cancel(self._scrollregion_after)
+            self._scrollregion_after = None
+        self.content_frame.destroy()
     
     def load_url(self, url: str):
         """Load URL in web viewer with enhanced CSS support"""
-        if not WEBVIEW_AVAILABLE or not hasattr(self, 'webview_frame'):
+        if not WEBVIEW_AVAILABLE:
             # Fallback to external browser
             import webbrowser
             webbrowser.open(url)
             return False
         
+        self._ensure_webview_area()
+        
         # Handle DuckDuckGo redirect URLs
-        if 'duckduckgo.com/l/?uddg=' in url:
-            try:
-                parsed = urllib.parse.urlparse(url)
-                params = urllib.parse.parse_qs(parsed.query)
-                if 'uddg' in params:
-                    url = urllib.parse.unquote(params['uddg'][0])
-            except Exception as e:
-                print(f"Error handling DuckDuckGo redirect: {e}")
+        url = _normalize_url(url)
         
         self.current_url = url
         # Add to history
         self.history.append(url)
         self.history_index = len(self.history) - 1
         
-        # Extract domain for title
-        domain = url.split('//')[1].split('/')[0] if '//' in url else url[:30]
-        self.title = domain[:25] + "..." if len(domain) > 25 else domain
+        self.title = _title_from_url(url)
         self.is_showing_web = True
         
         # Hide search frame first
-        self.search_frame.pack_forget()
+        if hasattr(self, 'search_frame'):
+            self.search_frame.pack_forget()
         
         # Show and update webview
         self.webview_frame.pack(fill=tk.BOTH, expand=True)
         
         try:
             # Check if CSS enhancement is enabled (configured in config.py)
+            self._nav_token += 1
             if config.ENABLE_CSS_ENHANCEMENT:
-                try:
-                    import requests
-                    from urllib.parse import urljoin
-                    
-                    response = requests.get(url, timeout=config.REQUEST_TIMEOUT, headers={
-                        'User-Agent': config.USER_AGENT
-                    })
-                    
-                    if response.status_code == 200:
-                        html_content = response.text
-                        
-                        # Get the base URL for relative links (handle redirects)
-                        base_url = response.url if response.url else url
-                        
-                        # Inject enhanced CSS and base tag into the HTML
-                        enhanced_css = f"<style>{get_enhanced_css()}</style>"
-                        base_tag = f'<base href="{base_url}">'
-                        enhanced_head = f'{base_tag}{enhanced_css}'
-                        
-                        # Try to inject CSS and base tag after <head> tag or at the beginning
-                        if '<head>' in html_content.lower():
-                            html_content = html_content.replace('<head>', f'<head>{enhanced_head}', 1)
-                        elif '<html>' in html_content.lower():
-                            html_content = html_content.replace('<html>', f'<html><head>{enhanced_head}</head>', 1)
-                        else:
-                            html_content = f'<html><head>{enhanced_head}</head><body>{html_content}</body></html>'
-                        
-                        # Load the enhanced HTML
-                        self.html_widget.load_html(html_content)
-                    else:
-                        # If fetch fails, fall back to direct URL load
-                        self.html_widget.load_url(url)
-                except Exception as e:
-                    # If enhancement fails, fall back to direct URL load
-                    if config.DEBUG_MODE:
-                        print(f"CSS enhancement failed, using direct load: {e}")
-                    self.html_widget.load_url(url)
+                # Fetch on a worker thread; _poll_fetch loads the result
+                future = _EXECUTOR.submit(_fetch_enhanced_html, url)
+                self.parent_frame.after(_FETCH_POLL_MS, self._poll_fetch, future, url, self._nav_token)
             else:
                 # CSS enhancement disabled - use direct URL loading (more stable)
-                if config.DEBUG_MODE:
-                    print(f"Loading URL directly (CSS enhancement disabled): {url}")
+                log.debug("Loading URL directly (CSS enhancement disabled): %s", url)
                 self.html_widget.load_url(url)
             
-            # Force frame update to ensure display
-            self.webview_frame.update_idletasks()
-            self.parent_frame.update_idletasks()
-            
-            # Start URL change detection with 3-second polling
             self._last_checked_url = url
-            self._check_pending = False
-            self.parent_frame.after(1500, self._check_url_change_fallback)
+            if self._use_polling:
+                self._schedule_url_poll()
             
             return True
         except Exception as e:
-            print(f"Error loading URL: {e}")
+            log.warning("Error loading URL: %s", e)
             return False
     
+    def _poll_fetch(self, future, url: str, token: int):
+        """Load a background page fetch into the webview once it completes"""
+        if token != self._nav_token:
+            # A newer navigation replaced this fetch; skip it if not started
+            future.cancel()
+            return
+        if not future.done():
+            self.parent_frame.after(_FETCH_POLL_MS, self._poll_fetch, future, url, token)
+            return
+        if not self.html_widget.winfo_exists():
+            # Tab was closed while the page was downloading
+            return
+        
+        try:
+            html_content = future.result()
+        except Exception as e:
+            # If enhancement fails, fall back to direct URL load
+            log.debug("CSS enhancement failed, using direct load: %s", e)
+            html_content = None
+        
+        try:
+            if html_content is None:
+                self.html_widget.load_url(url)
+            else:
+                self.html_widget.load_html(html_content)
+        except Exception as e:
+            log.warning("Error loading URL: %s", e)
+    
     def go_back(self):
         """Go back in browser history"""
         if WEBVIEW_AVAILABLE and hasattr(self, 'html_widget') and self.is_showing_web:
@@ -277,15 +479,14 @@ class BrowserTab:
                 self.history_index -= 1
                 url = self.history[self.history_index]
                 self.current_url = url
+                self._nav_token += 1
                 try:
                     self.html_widget.load_url(url)
-                    # Update title
-                    domain = url.split('//')[1].split('/')[0] if '//' in url else url[:30]
-                    self.title = domain[:25] + "..." if len(domain) > 25 else domain
+                    self.title = _title_from_url(url)
                     if self.on_navigation_callback:
                         self.on_navigation_callback(url, self.title)
                 except Exception as e:
-                    print(f"Back navigation error: {e}")
+                    log.warning("Back navigation error: %s", e)
     
     def go_forward(self):
         """Go forward in browser history"""
@@ -294,23 +495,23 @@ class BrowserTab:
                 self.history_index += 1
                 url = self.history[self.history_index]
                 self.current_url = url
+                self._nav_token += 1
                 try:
                     self.html_widget.load_url(url)
-                    # Update title
-                    domain = url.split('//')[1].split('/')[0] if '//' in url else url[:30]
-                    self.title = domain[:25] + "..." if len(domain) > 25 else domain
+                    self.title = _title_from_url(url)
                     if self.on_navigation_callback:
                         self.on_navigation_callback(url, self.title)
                 except Exception as e:
-                    print(f"Forward navigation error: {e}")
+                    log.warning("Forward navigation error: %s", e)
     
     def reload(self):
         """Reload current page"""
         if WEBVIEW_AVAILABLE and hasattr(self, 'html_widget') and self.current_url:
+            self._nav_token += 1
             try:
                 self.html_widget.load_url(self.current_url)
-            except:
-                pass
+            except Exception as e:
+                log.warning("Reload error: %s", e)
 
 
 class MiiBrowser:
@@ -333,10 +534,17 @@ class MiiBrowser:
         self.tab_buttons: Dict[int, tk.Frame] = {}
         self.active_tab_id: Optional[int] = None
         self.next_tab_id = 1
+        # Tab ids in display order, and each id's position in that list
+        self._tab_order: List[int] = []
+        self._tab_pos: Dict[int, int] = {}
+        # Tab currently painted as active, and the pending restyle callback
+        self._styled_tab_id: Optional[int] = None
+        self._tab_ui_after = None
         
         # Setup UI
         self._setup_ui()
         self._setup_keybindings()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # Create initial tab
         self._create_new_tab()
@@ -364,13 +572,9 @@ class MiiBrowser:
             tab_bar_container,
             text="+",
             command=self._create_new_tab,
-            bg="#FFFFFF",
-            fg="#5F6368",
             font=("Segoe UI", 14, "bold"),
-            relief=tk.FLAT,
-            cursor="hand2",
             width=3,
-            borderwidth=0
+            **_ICON_BUTTON_STYLE
         )
         new_tab_btn.pack(side=tk.RIGHT, padx=5, pady=5)
         
@@ -388,14 +592,8 @@ class MiiBrowser:
             nav_buttons,
             text="◄",
             command=self._go_back,
-            bg="#FFFFFF",
-            fg="#5F6368",
             font=("Segoe UI", 12),
-            relief=tk.FLAT,
-            cursor="hand2",
-            width=2,
-            borderwidth=0,
-            state=tk.DISABLED
+            **_NAV_BUTTON_STYLE
         )
         self.back_button.pack(side=tk.LEFT, padx=2)
         
@@ -404,14 +602,8 @@ class MiiBrowser:
             nav_buttons,
             text="►",
             command=self._go_forward,
-            bg="#FFFFFF",
-            fg="#5F6368",
             font=("Segoe UI", 12),
-            relief=tk.FLAT,
-            cursor="hand2",
-            width=2,
-            borderwidth=0,
-            state=tk.DISABLED
+            **_NAV_BUTTON_STYLE
         )
         self.forward_button.pack(side=tk.LEFT, padx=2)
         
@@ -420,14 +612,8 @@ class MiiBrowser:
             nav_buttons,
             text="⟳",
             command=self._reload_page,
-            bg="#FFFFFF",
-            fg="#5F6368",
             font=("Segoe UI", 14),
-            relief=tk.FLAT,
-            cursor="hand2",
-            width=2,
-            borderwidth=0,
-            state=tk.DISABLED
+            **_NAV_BUTTON_STYLE
         )
         self.reload_button.pack(side=tk.LEFT, padx=2)
         
@@ -446,15 +632,7 @@ class MiiBrowser:
         search_icon.pack(side=tk.LEFT, padx=(8, 5))
         
         # Search/URL entry
-        self.search_entry = tk.Entry(
-            entry_frame,
-            font=("Segoe UI", 12),
-            bg="#E8EAED",
-            fg="#202124",
-            insertbackground="#202124",
-            relief=tk.FLAT,
-            borderwidth=0
-        )
+        self.search_entry = tk.Entry(entry_frame, **_ENTRY_STYLE)
         self.search_entry.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 8), pady=8)
         self.search_entry.bind('<Return>', lambda e: self._perform_search())
         self.search_entry.bind('<FocusIn>', lambda e: self._on_entry_focus(entry_frame, True))
@@ -480,13 +658,9 @@ class MiiBrowser:
             address_frame,
             text="[ ]",
             command=self._toggle_fullscreen,
-            bg="#FFFFFF",
-            fg="#5F6368",
             font=("Segoe UI", 14),
-            relief=tk.FLAT,
-            cursor="hand2",
             width=2,
-            borderwidth=0
+            **_ICON_BUTTON_STYLE
         )
         fullscreen_button.pack(side=tk.LEFT, padx=2)
         
@@ -494,6 +668,35 @@ class MiiBrowser:
         self.tab_content_area = tk.Frame(main_frame, bg="#FFFFFF")
         self.tab_content_area.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
         
+        # One wheel binding serves the search canvas of every tab; X11 reports
+        # the wheel as buttons 4 and 5 instead of <MouseWheel>
+        self.root.bind_class("Canvas", "<MouseWheel>", self._on_mousewheel)
+        self.root.bind_class("Canvas", "<Button-4>", self._on_wheel_button)
+        self.root.bind_class("Canvas", "<Button-5>", self._on_wheel_button)
+    
+    def _on_mousewheel(self, event):
+        """Scroll the canvas under the mouse wheel"""
+        delta = event.delta
+        if sys.platform == "darwin":
+            # macOS reports raw scroll units instead of multiples of 120
+            units = -delta
+        elif delta >= 0:
+            units = -(delta // _WHEEL_DIV)
+        else:
+            units = -delta // _WHEEL_DIV
+        if units:
+            event.widget.yview_scroll(units, "units")
+        
+    def _on_wheel_button(self, event):
+        """Scroll the canvas under an X11 wheel button press"""
+        event.widget.yview_scroll(-1 if event.num == 4 else 1, "units")
+    
+    def _set_entry(self, text: str):
+        """Show text in the URL entry, leaving it untouched if already shown"""
+        if self.search_entry.get() != text:
+            self.search_entry.delete(0, tk.END)
+            self.search_entry.insert(0, text)
+    
     def _on_entry_focus(self, frame, focused):
         """Handle entry focus visual feedback"""
         if focused:
@@ -534,9 +737,12 @@ class MiiBrowser:
         tab = BrowserTab(tab_id, self.tab_content_area, self.search_engine)
         tab.on_navigation_callback = lambda url, title: self._on_tab_navigation(tab_id, url, title)
         self.tabs[tab_id] = tab
+        self._tab_pos[tab_id] = len(self._tab_order)
+        self._tab_order.append(tab_id)
         
         # Create tab button
-        tab_button_frame = tk.Frame(self.tab_bar, bg="#FFFFFF", relief=tk.FLAT, borderwidth=1)
+        # Buttons start out inactive; _restyle_tabs paints the active one
+        tab_button_frame = tk.Frame(self.tab_bar, bg="#E8EAED", relief=tk.FLAT, borderwidth=1)
         tab_button_frame.pack(side=tk.LEFT, padx=2, pady=5)
         
         # Tab title button
@@ -544,15 +750,7 @@ class MiiBrowser:
             tab_button_frame,
             text="New Tab",
             command=lambda: self._switch_tab(tab_id),
-            bg="#FFFFFF",
-            fg="#202124",
-            font=("Segoe UI", 10),
-            relief=tk.FLAT,
-            cursor="hand2",
-            width=20,
-            anchor=tk.W,
-            borderwidth=0,
-            padx=10
+            **_TAB_BUTTON_STYLE
         )
         tab_button.pack(side=tk.LEFT)
         
@@ -561,13 +759,7 @@ class MiiBrowser:
             tab_button_frame,
             text="×",
             command=lambda: self._close_tab(tab_id),
-            bg="#FFFFFF",
-            fg="#5F6368",
-            font=("Segoe UI", 12, "bold"),
-            relief=tk.FLAT,
-            cursor="hand2",
-            width=2,
-            borderwidth=0
+            **_TAB_CLOSE_STYLE
         )
         close_button.pack(side=tk.LEFT)
         
@@ -588,32 +780,36 @@ class MiiBrowser:
         # Hide current tab
         if self.active_tab_id and self.active_tab_id in self.tabs:
             self.tabs[self.active_tab_id].hide()
-            # Update inactive tab style
-            self.tab_buttons[self.active_tab_id]['frame'].config(bg="#E8EAED")
-            self.tab_buttons[self.active_tab_id]['button'].config(bg="#E8EAED")
-            self.tab_buttons[self.active_tab_id]['close'].config(bg="#E8EAED")
         
         # Show new tab
         self.active_tab_id = tab_id
-        self.tabs[tab_id].show()
+        tab = self.tabs[tab_id]
+        tab.show()
         
-        # Update active tab style
-        self.tab_buttons[tab_id]['frame'].config(bg="#FFFFFF")
-        self.tab_buttons[tab_id]['button'].config(bg="#FFFFFF")
-        self.tab_buttons[tab_id]['close'].config(bg="#FFFFFF")
-        
-        # Update tab title button text
-        self.tab_buttons[tab_id]['button'].config(text=self.tabs[tab_id].title)
+        # Title, URL entry and nav buttons are written right away, like the
+        # navigation handlers do, so a deferred write can never undo theirs
+        self.tab_buttons[tab_id]['button'].configure(text=tab.title)
+        self._set_entry(tab.current_url if tab.is_showing_web else "")
+        self._update_nav_buttons()
         
-        # Update URL entry if web page is showing
-        if self.tabs[tab_id].is_showing_web:
-            self.search_entry.delete(0, tk.END)
-            self.search_entry.insert(0, self.tabs[tab_id].current_url)
-        else:
-            self.search_entry.delete(0, tk.END)
+        # Repaint the tab colors once, after this burst of events
+        if self._tab_ui_after is None:
+            self._tab_ui_after = self.root.after_idle(self._restyle_tabs)
+    
+    def _restyle_tabs(self):
+        """Paint the active tab white and the previously active one grey"""
+        self._tab_ui_after = None
+        tab_id = self.active_tab_id
+        if tab_id not in self.tab_buttons:
+            return
         
-        # Update navigation button states
-        self._update_nav_buttons()
+        previous = self._styled_tab_id
+        if previous != tab_id and previous in self.tab_buttons:
+            for widget in self.tab_buttons[previous].values():
+                widget.configure(bg="#E8EAED")
+        for widget in self.tab_buttons[tab_id].values():
+            widget.configure(bg="#FFFFFF")
+        self._styled_tab_id = tab_id
     
     def _close_tab(self, tab_id: int):
         """Close a specific tab"""
@@ -624,9 +820,14 @@ class MiiBrowser:
         if len(self.tabs) == 1:
             return
         
-        # Hide and remove tab
-        self.tabs[tab_id].hide()
-        del self.tabs[tab_id]
+        # Remove tab and release its widgets and callbacks
+        self.tabs.pop(tab_id).destroy()
+        
+        # Drop it from the tab order and shift the positions after it
+        pos = self._tab_pos.pop(tab_id)
+        del self._tab_order[pos]
+        for i in range(pos, len(self._tab_order)):
+            self._tab_pos[self._tab_order[i]] = i
         
         # Remove tab button
         self.tab_buttons[tab_id]['frame'].destroy()
@@ -635,8 +836,7 @@ class MiiBrowser:
         # Switch to another tab if this was active
         if self.active_tab_id == tab_id:
             # Switch to first available tab
-            next_tab_id = list(self.tabs.keys())[0]
-            self._switch_tab(next_tab_id)
+            self._switch_tab(self._tab_order[0])
     
     def _close_active_tab(self):
         """Close the currently active tab"""
@@ -648,20 +848,16 @@ class MiiBrowser:
         if not self.active_tab_id:
             return
         
-        tab_ids = list(self.tabs.keys())
-        current_idx = tab_ids.index(self.active_tab_id)
-        next_idx = (current_idx + 1) % len(tab_ids)
-        self._switch_tab(tab_ids[next_idx])
+        next_idx = (self._tab_pos[self.active_tab_id] + 1) % len(self._tab_order)
+        self._switch_tab(self._tab_order[next_idx])
     
     def _previous_tab(self):
         """Switch to previous tab"""
         if not self.active_tab_id:
             return
         
-        tab_ids = list(self.tabs.keys())
-        current_idx = tab_ids.index(self.active_tab_id)
-        prev_idx = (current_idx - 1) % len(tab_ids)
-        self._switch_tab(tab_ids[prev_idx])
+        prev_idx = (self._tab_pos[self.active_tab_id] - 1) % len(self._tab_order)
+        self._switch_tab(self._tab_order[prev_idx])
     
     def _perform_search(self):
         """Perform search in active tab"""
@@ -673,31 +869,7 @@ class MiiBrowser:
         if not query:
             return
         
-        # Check if it's a URL
-        if query.startswith(('http://', 'https://')):
-            self._open_url_in_tab(query)
-            return
-        elif query.startswith('www.'):
-            self._open_url_in_tab('https://' + query)
-            return
-        elif '.' in query and ' ' not in query:
-            # Check if the part after the last dot looks like a valid TLD
-            tld = query.rsplit('.', 1)[-1].lower().split('/')[0]
-            common_tlds = {
-                'com', 'org', 'net', 'edu', 'gov', 'io', 'co', 'us', 'uk',
-                'de', 'fr', 'it', 'es', 'nl', 'ru', 'cn', 'jp', 'br', 'au',
-                'ca', 'in', 'eu', 'info', 'biz', 'cz', 'sk', 'pl', 'at',
-                'ch', 'me', 'tv', 'cc', 'dev', 'app', 'xyz',
-            }
-            if tld in common_tlds:
-                self._open_url_in_tab('https://' + query)
-                return
-        
-        # It's a search query - create DuckDuckGo URL
-        encoded_query = urllib.parse.quote_plus(query)
-        search_url = f"https://duckduckgo.com/?q={encoded_query}"
-        
-        self._open_url_in_tab(search_url)
+        self._open_url_in_tab(_resolve_query(query))
     
     def _open_url_in_tab(self, url: str):
         """Open URL in active tab"""
@@ -711,8 +883,7 @@ class MiiBrowser:
             self.tab_buttons[self.active_tab_id]['button'].config(text=active_tab.title)
             
             # Update URL entry
-            self.search_entry.delete(0, tk.END)
-            self.search_entry.insert(0, url)
+            self._set_entry(url)
             
             self._update_nav_buttons()
     
@@ -725,8 +896,7 @@ class MiiBrowser:
         
         # If this is the active tab, update the URL bar and navigation buttons
         if tab_id == self.active_tab_id:
-            self.search_entry.delete(0, tk.END)
-            self.search_entry.insert(0, url)
+            self._set_entry(url)
             self._update_nav_buttons()
     
     def _go_back(self):
@@ -793,6 +963,11 @@ class MiiBrowser:
         self.search_entry.select_range(0, tk.END)
         self.search_entry.icursor(tk.END)
     
+    def _on_close(self):
+        """Release this window's search session and close the window"""
+        self.search_engine.close()
+        self.root.destroy()
+    
     def run(self):
         """Start the browser application"""
         self.root.mainloop()
@@ -800,6 +975,11 @@ class MiiBrowser:
 
 def main():
     """Main entry point"""
+    # Errors are always reported; DEBUG_MODE adds the navigation trace
+    logging.basicConfig(
+        level=logging.DEBUG if config.DEBUG_MODE else logging.WARNING,
+        format="%(name)s: %(message)s",
+    )
     browser = MiiBrowser()
     browser.run()
 
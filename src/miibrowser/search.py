@@ -2,10 +2,18 @@
 Search module using DuckDuckGo API
 """
 
+import time
+from collections import OrderedDict
 import requests
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import json
 
+# Seconds a cached result list stays valid, and how many queries are kept
+CACHE_TTL = 600.0
+CACHE_SIZE = 128
+# Seconds an is_online() answer is reused before probing again
+ONLINE_TTL = 10.0
+
 
 class DuckDuckGoSearch:
     """Handle DuckDuckGo search queries"""
@@ -13,70 +21,124 @@ class DuckDuckGoSearch:
     def __init__(self):
         self.base_url = "https://api.duckduckgo.com/"
         self.instant_answer_url = "https://html.duckduckgo.com/html/"
+        # Reuse one session so follow-up queries keep the same TLS connection
+        self.session = requests.Session()
+        # Normalized query -> (time fetched, results), least recently used first
+        self._cache: "OrderedDict[str, Tuple[float, List[Dict[str, str]]]]" = OrderedDict()
+        # (time probed, result) of the last connectivity check
+        self._online: Optional[Tuple[float, bool]] = None
     
     def search(self, query: str) -> List[Dict[str, str]]:
         """
         Search using DuckDuckGo API
         
+        Repeated queries (ignoring case and surrounding whitespace) are
+        answered from an in-memory cache for CACHE_TTL seconds.
+        
         Args:
             query: Search query string
             
         Returns:
             List of search results with title, url, and description
         """
+        key = query.strip().casefold()
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < CACHE_TTL:
+            self._cache.move_to_end(key)
+            return [dict(result) for result in cached[1]]
+        
         try:
-            # DuckDuckGo Instant Answer API
-            params = {
-                'q': query,
-                'format': 'json',
-                'no_html': 1,
-                'skip_disambig': 1
-            }
-            
-            response = requests.get(self.base_url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            # Parse AbstractText
-            if data.get('AbstractText'):
-                results.append({
-                    'title': data.get('Heading', 'Result'),
-                    'url': data.get('AbstractURL', ''),
-                    'description': data.get('AbstractText', '')
-                })
-            
-            # Parse RelatedTopics
-            for topic in data.get('RelatedTopics', [])[:10]:
-                if isinstance(topic, dict) and 'Text' in topic:
-                    results.append({
-                        'title': topic.get('Text', '')[:100],
-                        'url': topic.get('FirstURL', ''),
-                        'description': topic.get('Text', '')
-                    })
-            
-            # If no results from instant answer, return a basic result
-            if not results:
-                results.append({
-                    'title': f'Search: {query}',
-                    'url': f'https://html.duckduckgo.com/html/?q={query}',
-                    'description': f'Click to search "{query}" on DuckDuckGo'
-                })
-            
-            return results
-            
+            results = self._fetch_results(query)
         except requests.exceptions.RequestException as e:
+            # Failures are not cached so the next attempt retries
             return [{
                 'title': 'Error',
                 'url': '',
                 'description': f'Search failed: {str(e)}'
             }]
+        
+        # If no results from instant answer, return a basic result. It is
+        # built from the cache key, since any spelling of the query that
+        # maps to the same key is answered with it.
+        if not results:
+            results.append({
+                'title': f'Search: {key}',
+                'url': f'https://html.duckduckgo.com/html/?q={key}',
+                'description': f'Click to search "{key}" on DuckDuckGo'
+            })
+        
+        self._cache[key] = (now, results)
+        self._cache.move_to_end(key)
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        # Callers get their own dicts, so edits never reach the cache
+        return [dict(result) for result in results]
+    
+    def _fetch_results(self, query: str) -> List[Dict[str, str]]:
+        """
+        Query the DuckDuckGo Instant Answer API
+        
+        Args:
+            query: Search query string
+            
+        Returns:
+            List of search results with title, url, and description,
+            empty if the API had no answer
+            
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        # DuckDuckGo Instant Answer API
+        params = {
+            'q': query,
+            'format': 'json',
+            'no_html': 1,
+            'skip_disambig': 1
+        }
+        
+        response = self.session.get(self.base_url, params=params, timeout=10)
+        response.raise_for_status()
+        
+        data = response.json()
+        results = []
+        
+        # Parse AbstractText
+        if data.get('AbstractText'):
+            results.append({
+                'title': data.get('Heading', 'Result'),
+                'url': data.get('AbstractURL', ''),
+                'description': data.get('AbstractText', '')
+            })
+        
+        # Parse RelatedTopics
+        for topic in data.get('RelatedTopics', [])[:10]:
+            if isinstance(topic, dict) and 'Text' in topic:
+                results.append({
+                    'title': topic.get('Text', '')[:100],
+                    'url': topic.get('FirstURL', ''),
+                    'description': topic.get('Text', '')
+                })
+        
+        return results
     
     def is_online(self) -> bool:
-        """Check if internet connection is available"""
+        """Check if internet connection is available
+        
+        The answer is reused for ONLINE_TTL seconds, so frequent callers do
+        not pay a network round trip each time.
+        """
+        now = time.monotonic()
+        if self._online is not None and now - self._online[0] < ONLINE_TTL:
+            return self._online[1]
         try:
-            response = requests.get('https://www.duckduckgo.com', timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+            response = self.session.get('https://www.duckduckgo.com', timeout=5)
+            online = response.status_code == 200
+        except requests.exceptions.RequestException:
+            online = False
+        self._online = (now, online)
+        return online
+    
+    def close(self):
+        """Close pooled connections held by the search session"""
+        self.session.close()
@@ -3,7 +3,8 @@ Tests for browser GUI
 """
 
 import pytest
-from miibrowser.browser import MiiBrowser
+from miibrowser import browser
+from miibrowser.browser import BrowserTab, MiiBrowser, _normalize_url, _resolve_query, _title_from_url
 
 
 class TestMiiBrowser:
@@ -38,3 +39,275 @@ class TestMiiBrowser:
             browser.root.destroy()
         except Exception as e:
             pytest.skip(f"GUI not available: {e}")
+
+
+class TestQueryResolution:
+    """Test cases for address bar input handling"""
+    
+    def test_full_url_is_kept(self):
+        """Test that explicit URLs are opened as typed"""
+        assert _resolve_query("http://example.com/a") == "http://example.com/a"
+    
+    def test_www_prefix_gets_scheme(self):
+        """Test that www. addresses get an https scheme"""
+        assert _resolve_query("www.example.org") == "https://www.example.org"
+    
+    def test_known_tld_is_treated_as_address(self):
+        """Test that bare domains with a known TLD are opened directly"""
+        assert _resolve_query("example.cz/page") == "https://example.cz/page"
+    
+    def test_text_becomes_duckduckgo_search(self):
+        """Test that plain text is searched on DuckDuckGo"""
+        assert _resolve_query("python tkinter") == "https://duckduckgo.com/?q=python+tkinter"
+        assert _resolve_query("file.unknowntld") == "https://duckduckgo.com/?q=file.unknowntld"
+
+
+class TestTabTitles:
+    """Test cases for deriving tab titles from URLs"""
+    
+    def test_title_is_domain(self):
+        """Test that the title is the URL's domain"""
+        assert _title_from_url("https://www.python.org/downloads/") == "www.python.org"
+    
+    def test_long_domain_is_truncated(self):
+        """Test that long domains are shortened with an ellipsis"""
+        title = _title_from_url("https://a-very-long-subdomain.example-domain.com/")
+        assert title == "a-very-long-subdomain.exa..."
+    
+    def test_url_without_domain(self):
+        """Test that URLs without a network location use the URL itself"""
+        assert _title_from_url("about:blank") == "about:blank"
+
+
+class TestNormalizeUrl:
+    """Test cases for DuckDuckGo redirect unwrapping"""
+    
+    def test_redirect_is_unwrapped(self):
+        """Test that the uddg target replaces the redirect"""
+        url = "https://duckduckgo.com/l/?uddg=https%3A%2F%2Fexample.com%2Fpage&rut=abc"
+        assert _normalize_url(url) == "https://example.com/page"
+    
+    def test_plain_url_is_unchanged(self):
+        """Test that ordinary URLs pass through"""
+        assert _normalize_url("https://example.com/") == "https://example.com/"
+
+
+class TestTabHistory:
+    """Test cases for per-tab back/forward history"""
+    
+    def _make_tab(self, monkeypatch, max_history=200):
+        """Build a BrowserTab without any widgets"""
+        monkeypatch.setattr(browser.config, "MAX_HISTORY", max_history)
+        tab = BrowserTab.__new__(BrowserTab)
+        tab.history = browser.deque(maxlen=browser.config.MAX_HISTORY)
+        tab.history_index = -1
+        tab.current_url = ""
+        tab.on_navigation_callback = None
+        tab._nav_token = 0
+        return tab
+    
+    def test_new_page_drops_forward_entries(self, monkeypatch):
+        """Test that navigating after going back discards forward history"""
+        tab = self._make_tab(monkeypatch)
+        for url in ("https://a.com/", "https://b.com/", "https://c.com/"):
+            tab._on_url_changed(url)
+        tab.history_index = 0
+        tab.current_url = "https://a.com/"
+        tab._on_url_changed("https://d.com/")
+        assert list(tab.history) == ["https://a.com/", "https://d.com/"]
+        assert tab.history_index == 1
+    
+    def test_url_change_supersedes_pending_fetch(self, monkeypatch):
+        """Test that a stale page fetch is cancelled instead of loaded"""
+        tab = self._make_tab(monkeypatch)
+        future = browser._EXECUTOR.submit(lambda: "<html></html>")
+        future.result()
+        stale_token = tab._nav_token
+        tab._on_url_changed("https://a.com/")
+        # A superseded fetch must return before touching any widget
+        tab._poll_fetch(future, "https://old.com/", stale_token)
+        assert tab._nav_token == stale_token + 1
+    
+    def test_history_is_bounded(self, monkeypatch):
+        """Test that only MAX_HISTORY entries are kept"""
+        tab = self._make_tab(monkeypatch, max_history=3)
+        for i in range(5):
+            tab._on_url_changed(f"https://site{i}.com/")
+        assert list(tab.history) == [f"https://site{i}.com/" for i in (2, 3, 4)]
+        assert tab.history_index == 2
+
+
+class _FakeWidget:
+    def __init__(self):
+        self.cancelled = []
+        self.destroyed = False
+    
+    def after_cancel(self, after_id):
+        self.cancelled.append(after_id)
+    
+    def destroy(self):
+        self.destroyed = True
+
+
+class TestTabDestroy:
+    """Test cases for closing a tab"""
+    
+    def test_destroy_cancels_callbacks(self):
+        """Test that pending polls are cancelled and widgets destroyed"""
+        tab = BrowserTab.__new__(BrowserTab)
+        tab.parent_frame = tab.canvas = tab.content_frame = _FakeWidget()
+        tab._nav_token = 0
+        tab._poll_after_id = "after#1"
+        tab._scrollregion_after = "after#2"
+        tab.destroy()
+        assert tab.parent_frame.cancelled == ["after#1", "after#2"]
+        assert tab.content_frame.destroyed
+        assert tab._nav_token == 1
+
+
+
+class _FakeRoot:
+    def __init__(self):
+        self.idle = []
+    
+    def after_idle(self, callback):
+        self.idle.append(callback)
+        return "after#idle"
+
+
+class _FakeButton:
+    def __init__(self):
+        self.options = {}
+    
+    def configure(self, **options):
+        self.options.update(options)
+    
+    config = configure
+
+
+class _FakeTab:
+    def __init__(self, url):
+        self.title = url
+        self.current_url = url
+        self.is_showing_web = bool(url)
+    
+    def show(self):
+        pass
+    
+    def hide(self):
+        pass
+
+
+class TestTabSwitch:
+    """Test cases for switching between tabs"""
+    
+    def _make_browser(self):
+        app = MiiBrowser.__new__(MiiBrowser)
+        app.root = _FakeRoot()
+        app.tabs = {1: _FakeTab(""), 2: _FakeTab("https://b.example/")}
+        app.tab_buttons = {
+            tab_id: {'frame': _FakeButton(), 'button': _FakeButton(), 'close': _FakeButton()}
+            for tab_id in app.tabs
+        }
+        app.active_tab_id = 1
+        app._styled_tab_id = 1
+        app._tab_ui_after = None
+        app.entries = []
+        app._set_entry = app.entries.append
+        app._update_nav_buttons = lambda: None
+        return app
+    
+    def test_entry_is_written_synchronously(self):
+        """Test that the URL entry follows the active tab immediately"""
+        app = self._make_browser()
+        app._switch_tab(2)
+        assert app.entries == ["https://b.example/"]
+        assert app.tab_buttons[2]['button'].options['text'] == "https://b.example/"
+    
+    def test_deferred_restyle_does_not_overwrite_navigation(self):
+        """Test that the queued repaint only touches tab colors"""
+        app = self._make_browser()
+        app._switch_tab(2)
+        app._switch_tab(1)
+        app._on_tab_navigation(1, "https://c.example/", "c.example")
+        assert len(app.root.idle) == 1
+        app.root.idle.pop()()
+        assert app.entries[-1] == "https://c.example/"
+        assert app.tab_buttons[1]['button'].options == {'bg': "#FFFFFF", 'text': "c.example"}
+        assert app.tab_buttons[2]['frame'].options.get('bg') != "#FFFFFF"
+
+
+class _FakeSearchEngine:
+    def __init__(self):
+        self.closed = False
+    
+    def close(self):
+        self.closed = True
+
+
+class TestBrowserClose:
+    """Test cases for closing the browser window"""
+    
+    def test_close_keeps_shared_fetch_resources(self):
+        """Test that closing one window leaves the fetch pool usable"""
+        app = MiiBrowser.__new__(MiiBrowser)
+        app.search_engine = _FakeSearchEngine()
+        app.root = _FakeWidget()
+        app._on_close()
+        assert app.search_engine.closed
+        assert app.root.destroyed
+        assert browser._EXECUTOR.submit(lambda: 42).result(timeout=5) == 42
+
+
+class _FakeResponse:
+    def __init__(self, text, status_code=200, url=""):
+        self.content = text.encode("utf-8")
+        self.encoding = "utf-8"
+        self.status_code = status_code
+        self.url = url
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+
+class TestFetchEnhancedHtml:
+    """Test cases for the background page fetch"""
+    
+    def test_css_injected_into_head(self, monkeypatch):
+        """Test that the style and base tags follow <head>"""
+        page = "<html><head><title>x</title></head><body></body></html>"
+        monkeypatch.setattr(browser._SESSION, "get",
+                            lambda *a, **kw: _FakeResponse(page, url="https://example.com/"))
+        html = browser._fetch_enhanced_html("https://example.com")
+        assert html.startswith('<html><head><base href="https://example.com/"><style>')
+        assert html.endswith("<title>x</title></head><body></body></html>")
+    
+    def test_head_tag_with_attributes(self, monkeypatch):
+        """Test that <HEAD lang=..> is found but <header> is not"""
+        page = '<HTML><body><header>h</header></body><HEAD lang="en"></HEAD></HTML>'
+        monkeypatch.setattr(browser._SESSION, "get", lambda *a, **kw: _FakeResponse(page))
+        html = browser._fetch_enhanced_html("https://example.com")
+        assert html.startswith('<HTML><body><header>h</header></body><HEAD lang="en"><base ')
+    
+    def test_non_200_returns_none(self, monkeypatch):
+        """Test that error responses fall back to a direct load"""
+        monkeypatch.setattr(browser._SESSION, "get",
+                            lambda *a, **kw: _FakeResponse("", status_code=404))
+        assert browser._fetch_enhanced_html("https://example.com") is None
+    
+    def test_download_is_capped(self, monkeypatch):
+        """Test that pages beyond MAX_PAGE_BYTES are cut off"""
+        monkeypatch.setattr(browser.config, "MAX_PAGE_BYTES", 100)
+        monkeypatch.setattr(browser, "_FETCH_CHUNK_SIZE", 30)
+        monkeypatch.setattr(browser._SESSION, "get",
+                            lambda *a, **kw: _FakeResponse("x" * 1000))
+        html = browser._fetch_enhanced_html("https://example.com")
+        assert html.endswith("x" * 100 + "</body></html>")
+        assert "x" * 101 not in html
@@ -0,0 +1,40 @@
+"""
+Tests for the CSS enhancement module
+"""
+
+from miibrowser.css_parser import CSSParser
+from miibrowser.css_enhancer import (
+    get_enhanced_css,
+    get_css_injection_script,
+    get_default_injection_script,
+)
+
+
+class TestCSSEnhancer:
+    """Test cases for enhanced CSS and its injection script"""
+    
+    def test_enhanced_css_is_shared(self):
+        """Test that the same CSS object is returned on every call"""
+        assert get_enhanced_css() is get_enhanced_css()
+        assert "MiiBrowser Enhanced CSS Support" in get_enhanced_css(pretty=True)
+    
+    def test_enhanced_css_is_minified(self):
+        """Test that the default CSS is a minified copy of the commented source"""
+        css = get_enhanced_css()
+        assert "/*" not in css and "\n" not in css
+        assert len(css) < len(get_enhanced_css(pretty=True))
+        parser = CSSParser()
+        assert css == parser.minify_css(get_enhanced_css(pretty=True))
+        assert (len(parser.extract_selectors(css))
+                == len(parser.extract_selectors(get_enhanced_css(pretty=True))))
+    
+    def test_injection_script_escapes_css(self):
+        """Test that quotes, backslashes and newlines are escaped"""
+        script = get_css_injection_script('a::before { content: "\\2014 \'x\'"; }\nb {}')
+        assert 'innerHTML = "a::before { content: \\"\\\\2014 \\\'x\\\'\\"; }\\nb {}";' in script
+    
+    def test_default_injection_script_is_cached(self):
+        """Test that the default script is built once"""
+        script = get_default_injection_script()
+        assert script is get_default_injection_script()
+        assert "\n" not in script.split('innerHTML = "', 1)[1].split('";', 1)[0]
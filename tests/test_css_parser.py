@@ -3,6 +3,7 @@ Tests for CSS parser module
 """
 
 import pytest
+from miibrowser import css_parser
 from miibrowser.css_parser import (
     CSSParser, 
     parse_inline_style, 
@@ -44,6 +45,93 @@ class TestCSSParser:
         assert len(rules) > 0
         assert rules is not None
     
+    def test_parse_stylesheet_reuses_cached_parse(self):
+        """Test that repeated parses of the same text share the cached rules"""
+        first = self.parser.parse_stylesheet(self.sample_css)
+        second = self.parser.parse_stylesheet(self.sample_css)
+        assert first == second
+        assert all(a is b for a, b in zip(first, second))
+    
+    def test_parse_large_stylesheet_is_cached(self):
+        """Test that large sources are cached under a digest of their text"""
+        css = "a { color: red; }\n" * 500
+        first = self.parser.parse_stylesheet(css)
+        second = self.parser.parse_stylesheet("".join(["a { color: red; }\n"] * 500))
+        assert len(first) == 1000  # each rule is followed by a whitespace token
+        assert all(a is b for a, b in zip(first, second))
+    
+    def _count_cache_lookups(self, monkeypatch):
+        """Wrap the shared parse cache so calls to it are counted"""
+        calls = []
+        cached = css_parser._parse_stylesheet_cached
+        def counting(css_text):
+            calls.append(css_text)
+            return cached(css_text)
+        monkeypatch.setattr(css_parser, '_parse_stylesheet_cached', counting)
+        return calls
+    
+    def test_parse_stylesheet_reuses_last_source(self, monkeypatch):
+        """Test that the same short source object is not looked up again"""
+        calls = self._count_cache_lookups(monkeypatch)
+        first = self.parser.parse_stylesheet(self.sample_css)
+        assert len(self.parser.extract_selectors(self.sample_css)) == 3
+        assert self.parser.parse_stylesheet(self.sample_css) == first
+        assert len(calls) == 1
+    
+    def test_large_source_is_not_held_by_parser(self, monkeypatch):
+        """Test that long sources go back to the digest-keyed cache each time"""
+        calls = self._count_cache_lookups(monkeypatch)
+        css = "a { color: red; }\n" * 500
+        first = self.parser.parse_stylesheet(css)
+        assert self.parser.parse_stylesheet(css) == first
+        assert len(calls) == 2
+    
+    def test_rule_declarations_parsed_once(self):
+        """Test that extractors share one declaration parse per rule"""
+        css = "@import url(a.css); p { color: red; /* c */ margin: 0; }"
+        self.parser.extract_colors(css)
+        parsed = css_parser._parse_stylesheet_cached(css)
+        rule = parsed.rules[-1]
+        decls = parsed.declarations(rule)
+        assert [d.name for d in decls] == ['color', 'margin']
+        assert parsed.declarations(rule) is decls
+        assert parsed.declarations(parsed.rules[0]) == ()
+    
+    def test_rule_declarations_evicted_with_parse(self):
+        """Test that cached declarations live on the parse cache entry"""
+        css = "p { color: red; }\n" * 300
+        parsed = css_parser._parse_stylesheet_cached(css)
+        self.parser.get_all_declarations(css)
+        assert len(parsed._declarations) == 300
+        for i in range(css_parser._LARGE_PARSE_CACHE_SIZE):
+            css_parser._parse_stylesheet_cached(f"/* {i} */" + css)
+        assert parsed not in css_parser._large_parse_cache.values()
+    
+    def test_extractors_update_parsed_rules(self):
+        """Test that every extractor records the rules it worked on"""
+        other = "i { color: blue; }"
+        expected = list(css_parser._parse_stylesheet_cached(self.sample_css).rules)
+        calls = [
+            lambda css: self.parser.extract_colors(css),
+            lambda css: self.parser.extract_selectors(css),
+            lambda css: self.parser.extract_properties(css, "color"),
+            lambda css: self.parser.get_all_declarations(css),
+            lambda css: self.parser.parse_media_queries(css),
+            lambda css: self.parser.prettify_css(css),
+        ]
+        for call in calls:
+            self.parser.parse_stylesheet(other)
+            call(self.sample_css)
+            assert self.parser.parsed_rules == expected
+            assert self.parser.stylesheet is self.parser.parsed_rules
+    
+    def test_parse_stylesheet_result_is_a_copy(self):
+        """Test that mutating a returned rule list does not affect the cache"""
+        rules = self.parser.parse_stylesheet(self.sample_css)
+        count = len(rules)
+        rules.clear()
+        assert len(self.parser.parse_stylesheet(self.sample_css)) == count
+    
     def test_parse_empty_stylesheet(self):
         """Test parsing empty stylesheet"""
         rules = self.parser.parse_stylesheet("")
@@ -65,6 +153,33 @@ class TestCSSParser:
         assert any('#333' in color for color in colors)
         assert any('white' in color for color in colors)
     
+    def test_extract_unique_colors(self):
+        """Test extracting de-duplicated color values in first-seen order"""
+        css = "a { color: red; } b { color: blue; } i { color: red; }"
+        assert self.parser.extract_colors(css) == ['red', 'blue', 'red']
+        assert self.parser.extract_colors(css, unique=True) == ['red', 'blue']
+    
+    def test_is_color_property(self):
+        """Test the cached color property check"""
+        assert css_parser._is_color_property("background-color")
+        assert css_parser._is_color_property("Border-Top")
+        assert css_parser._is_color_property("stroke")
+        assert not css_parser._is_color_property("margin")
+    
+    def test_iter_selectors_is_lazy(self):
+        """Test that the iterator API yields results one at a time"""
+        selectors = self.parser.iter_selectors(self.sample_css)
+        assert next(selectors).strip() == 'body'
+        assert [s.strip() for s in selectors] == ['.header', '#main-content']
+    
+    def test_iter_variants_match_lists(self):
+        """Test that the iterators yield the same items as the list methods"""
+        css = self.sample_css
+        assert list(self.parser.iter_colors(css)) == self.parser.extract_colors(css)
+        assert (list(self.parser.iter_properties(css, "padding"))
+                == self.parser.extract_properties(css, "padding"))
+        assert dict(self.parser.iter_declarations(css)) == self.parser.get_all_declarations(css)
+    
     def test_extract_properties(self):
         """Test extracting specific CSS properties"""
         font_sizes = self.parser.extract_properties(self.sample_css, "font-size")
@@ -99,6 +214,13 @@ class TestCSSParser:
         assert self.parser.validate_color("rgb(255, 0, 0)")
         assert self.parser.validate_color("rgba(255, 0, 0, 0.5)")
     
+    def test_validate_color_is_cached(self):
+        """Test that repeated color checks are served from the cache"""
+        css_parser._validate_color.cache_clear()
+        self.parser.validate_color("#007bff")
+        self.parser.validate_color("#007bff")
+        assert css_parser._validate_color.cache_info().hits == 1
+    
     def test_minify_css(self):
         """Test CSS minification"""
         minified = self.parser.minify_css(self.sample_css)
@@ -108,12 +230,50 @@ class TestCSSParser:
         # Verify it contains CSS selectors
         assert 'body' in minified or '.header' in minified
     
+    def test_minify_css_output(self):
+        """Test that minification strips comments and redundant whitespace"""
+        css = """
+            /* comment */
+            div > p, a:hover {
+                width: calc(100% - 50px);
+                content: "keep  /* this */";
+            }
+        """
+        minified = self.parser.minify_css(css)
+        assert minified == 'div>p,a:hover{width:calc(100% - 50px);content:"keep  /* this */"}'
+    
+    def test_minify_css_keeps_descendant_pseudo_class(self):
+        """Test that whitespace before a pseudo-class selector is preserved"""
+        assert self.parser.minify_css("div :hover { color: red; }") == "div :hover{color:red}"
+    
+    def test_minify_css_escaped_quotes(self):
+        """Test that escaped quotes outside strings do not start a string"""
+        css = ".a\\\"b { color: red; }  p::after { content: \\'; }  i { margin: 0 }"
+        assert self.parser.minify_css(css) == ".a\\\"b{color:red}p::after{content:\\'}i{margin:0}"
+    
+    def test_minify_css_escaped_brace_in_selector(self):
+        """Test that an escaped brace in a selector is kept with its spacing"""
+        css = ".w\\{ span { color: red; }  .x\\} { margin: 0; }"
+        assert self.parser.minify_css(css) == ".w\\{ span{color:red}.x\\}{margin:0}"
+    
+    def test_minify_css_strict_drops_invalid_rules(self):
+        """Test that strict minification goes through the parser"""
+        css = "a { color: red; } b { margin: 0 } stray"
+        assert self.parser.minify_css(css) == "a{color:red}b{margin:0}stray"
+        assert self.parser.minify_css(css, strict=True) == "a{color:red}b{margin:0}"
+    
     def test_prettify_css(self):
         """Test CSS prettification"""
         prettified = self.parser.prettify_css(self.sample_css)
         assert prettified is not None
         assert len(prettified) > 0
     
+    def test_prettify_css_layout(self):
+        """Test that blocks are separated by one blank line with no trailing one"""
+        prettified = self.parser.prettify_css("a{color:red!important;margin:0} b{}", indent="\t")
+        assert prettified == "a {\n\tcolor: red !important;\n\tmargin: 0;\n}\n\nb {\n}\n"
+        assert self.parser.prettify_css("") == ""
+    
     def test_parse_media_queries(self):
         """Test parsing media queries"""
         css_with_media = """
@@ -269,6 +429,12 @@ class TestColorExtraction:
         css = "a { color: hsl(120, 100%, 50%); }"
         colors = extract_css_colors(css)
         assert len(colors) > 0
+    
+    def test_extract_colors_without_a_parser(self, monkeypatch):
+        """Test that the helper reads the shared parse cache directly"""
+        monkeypatch.setattr(css_parser, 'CSSParser', None)
+        css = "a { color: red; } b { background: #fff; }"
+        assert extract_css_colors(css) == ['red', '#fff']
 
 
 class TestCSSValidation:
@@ -297,6 +463,43 @@ class TestCSSValidation:
         """
         is_valid, error = validate_css(css)
         assert is_valid == True
+    
+    def test_validate_unclosed_block(self):
+        """Test that an unclosed block is reported"""
+        is_valid, error = validate_css("body { color: red;")
+        assert is_valid == False
+        assert "'{'" in error
+    
+    def test_validate_unbalanced_parenthesis(self):
+        """Test that a stray closing parenthesis is reported"""
+        is_valid, error = validate_css("div { width: calc(100% - 10px)); }")
+        assert is_valid == False
+        assert "')'" in error
+    
+    def test_validate_unterminated_string(self):
+        """Test that an unterminated string is reported"""
+        is_valid, error = validate_css('p::before { content: "oops; }')
+        assert is_valid == False
+    
+    def test_validate_brackets_inside_strings_and_comments(self):
+        """Test that brackets in strings and comments are ignored"""
+        css = 'p::before { content: "}"; } /* { */'
+        assert validate_css(css) == (True, None)
+    
+    def test_validate_strict_reports_parse_errors(self):
+        """Test that strict mode reports errors found by the full parser"""
+        assert validate_css("body { color: red; }", strict=True) == (True, None)
+        # Balanced, but the trailing selector never gets a {} block
+        assert validate_css("a { color: red; } p", strict=True)[0] == False
+    
+    def test_validate_large_stylesheet_cached_by_digest(self):
+        """Test that long sources are cached under a digest, not the text"""
+        css = "a { color: red; }\n" * 500
+        assert validate_css(css) == (True, None)
+        assert validate_css(css + "p", strict=True)[0] == False
+        keys = list(css_parser._large_validate_cache)
+        assert all(isinstance(digest, bytes) and len(digest) == 16 for digest, _ in keys)
+        assert (css_parser._source_digest(css), False) in css_parser._large_validate_cache
 
 
 class TestEdgeCases:
@@ -0,0 +1,33 @@
+"""
+Tests for the miibrowser package namespace
+"""
+
+import subprocess
+import sys
+
+import pytest
+import miibrowser
+
+
+class TestPackageImports:
+    """Test cases for lazily imported package attributes"""
+    
+    def test_import_does_not_load_gui(self):
+        """Test that importing the package does not import tkinter"""
+        code = (
+            "import sys, miibrowser; "
+            "miibrowser.validate_css('a { color: red; }'); "
+            "print('tkinter' in sys.modules)"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code], text=True)
+        assert output.strip() == "False"
+    
+    def test_public_names_resolve(self):
+        """Test that every name in __all__ can be accessed"""
+        for name in miibrowser.__all__:
+            assert getattr(miibrowser, name) is not None
+    
+    def test_unknown_attribute_raises(self):
+        """Test that unknown attributes still raise AttributeError"""
+        with pytest.raises(AttributeError):
+            miibrowser.does_not_exist
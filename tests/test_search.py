@@ -3,6 +3,8 @@ Tests for DuckDuckGo search module
 """
 
 import pytest
+import requests
+from miibrowser import search
 from miibrowser.search import DuckDuckGoSearch
 
 
@@ -44,3 +46,103 @@ class TestDuckDuckGoSearch:
         """Test that is_online method exists"""
         assert hasattr(self.search_engine, 'is_online')
         assert callable(self.search_engine.is_online)
+    
+    def test_search_engine_reuses_session(self):
+        """Test that the search engine keeps a persistent HTTP session"""
+        assert hasattr(self.search_engine, 'session')
+        self.search_engine.close()
+
+
+class _FakeResponse:
+    def __init__(self, data):
+        self._data = data
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self._data
+
+
+class TestSearchCache:
+    """Test cases for the in-memory search result cache"""
+    
+    def setup_method(self):
+        """Setup a search engine whose network calls are counted"""
+        self.search_engine = DuckDuckGoSearch()
+        self.calls = []
+    
+    def _fake_get(self, url, params=None, timeout=None):
+        self.calls.append(params['q'])
+        return _FakeResponse({'Heading': 'Python', 'AbstractText': 'A language',
+                              'AbstractURL': 'https://python.org'})
+    
+    def test_repeat_query_uses_cache(self, monkeypatch):
+        """Test that the same query (ignoring case/whitespace) is fetched once"""
+        monkeypatch.setattr(self.search_engine.session, "get", self._fake_get)
+        first = self.search_engine.search("Python")
+        second = self.search_engine.search("  python ")
+        assert first == second
+        assert self.calls == ["Python"]
+    
+    def test_mutating_results_does_not_change_cache(self, monkeypatch):
+        """Test that callers get copies of the cached result dicts"""
+        monkeypatch.setattr(self.search_engine.session, "get", self._fake_get)
+        first = self.search_engine.search("python")
+        first[0]['title'] = 'Changed'
+        second = self.search_engine.search("python")
+        second[0]['url'] = ''
+        assert self.search_engine.search("python")[0] == {
+            'title': 'Python', 'url': 'https://python.org', 'description': 'A language'}
+    
+    def test_fallback_uses_normalized_query(self, monkeypatch):
+        """Test that the no-answer fallback does not depend on query casing"""
+        def empty_get(url, params=None, timeout=None):
+            self.calls.append(params['q'])
+            return _FakeResponse({})
+        monkeypatch.setattr(self.search_engine.session, "get", empty_get)
+        first = self.search_engine.search("python")
+        assert self.search_engine.search(" PYTHON ") == first
+        assert first[0]['title'] == 'Search: python'
+        assert len(self.calls) == 1
+    
+    def test_expired_entry_is_refetched(self, monkeypatch):
+        """Test that entries older than CACHE_TTL are ignored"""
+        monkeypatch.setattr(self.search_engine.session, "get", self._fake_get)
+        self.search_engine.search("python")
+        monkeypatch.setattr(search, "CACHE_TTL", 0.0)
+        self.search_engine.search("python")
+        assert len(self.calls) == 2
+    
+    def test_cache_is_bounded(self, monkeypatch):
+        """Test that the least recently used query is evicted"""
+        monkeypatch.setattr(self.search_engine.session, "get", self._fake_get)
+        monkeypatch.setattr(search, "CACHE_SIZE", 2)
+        for query in ("a", "b", "a", "c", "a", "b"):
+            self.search_engine.search(query)
+        assert self.calls == ["a", "b", "c", "b"]
+    
+    def test_errors_are_not_cached(self, monkeypatch):
+        """Test that a failed search is retried"""
+        def failing_get(*args, **kwargs):
+            self.calls.append(kwargs['params']['q'])
+            raise requests.exceptions.ConnectionError("offline")
+        monkeypatch.setattr(self.search_engine.session, "get", failing_get)
+        assert self.search_engine.search("python")[0]['title'] == 'Error'
+        self.search_engine.search("python")
+        assert len(self.calls) == 2
+    
+    def test_is_online_is_cached(self, monkeypatch):
+        """Test that connectivity is probed once per ONLINE_TTL"""
+        class _Ok:
+            status_code = 200
+        def fake_get(*args, **kwargs):
+            self.calls.append(args[0])
+            return _Ok()
+        monkeypatch.setattr(self.search_engine.session, "get", fake_get)
+        assert self.search_engine.is_online()
+        assert self.search_engine.is_online()
+        assert len(self.calls) == 1
+        monkeypatch.setattr(search, "ONLINE_TTL", 0.0)
+        assert self.search_engine.is_online()
+        assert len(self.calls) == 2